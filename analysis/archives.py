@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""The module reads source files of zip and tar archives without extraction.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import zlib
+import tarfile
+import zipfile
+
+ZIP_SUFFIXES = ('.zip', '.whl', '.egg')
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2')
+ARCHIVE_GLOBS = tuple('*' + suffix for suffix in ZIP_SUFFIXES + TAR_SUFFIXES)
+MEMBER_SEPARATOR = '!'
+ZIP_ENCRYPTED_FLAG = 0x1
+
+
+class ArchiveError(Exception):
+    """The exception is raised if an archive can not be read."""
+    pass
+
+
+def is_archive(path):
+    """Returns True if the path has a suffix of a supported archive."""
+    return path.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES)
+
+
+def _to_str(name):
+    if isinstance(name, unicode):  # zip members with UTF-8 names
+        return name.encode('utf-8')
+    return name
+
+
+def _read_member(read, size, check_size):
+    """Returns a tuple of a content of a member and an exception which
+    prevented reading it."""
+    if check_size is not None:
+        try:
+            check_size(size)
+        except Exception as e:  # the member is not decompressed at all
+            return None, e
+    try:
+        return read(), None
+    except (RuntimeError, NotImplementedError, zlib.error,
+            zipfile.BadZipfile) as e:  # e.g. encrypted or bzip2 members
+        return None, ArchiveError('Error: member can not be read: ' +
+                                  str(e))
+
+
+def _iter_zip_sources(archive_path, check_size):
+    with zipfile.ZipFile(archive_path) as archive:
+        for info in archive.infolist():
+            if not info.filename.lower().endswith('.py'):
+                continue
+            if info.flag_bits & ZIP_ENCRYPTED_FLAG:
+                content, error = None, ArchiveError(
+                    'Error: member is encrypted and can not be read')
+            else:
+                content, error = _read_member(lambda: archive.read(info),
+                                              info.file_size, check_size)
+            yield _to_str(info.filename), content, error
+
+
+def _iter_tar_sources(archive_path, check_size):
+    # the stream mode reads a compressed archive once from the beginning
+    # instead of seeking back to every member
+    archive = tarfile.open(archive_path, 'r|*')
+    try:
+        for member in archive:
+            if member.isfile() and member.name.lower().endswith('.py'):
+                content, error = _read_member(
+                    lambda: archive.extractfile(member).read(), member.size,
+                    check_size)
+                yield member.name, content, error
+    finally:
+        archive.close()
+
+
+def iter_archive_sources(archive_path, check_size=None):
+    """Yields names and contents of .py files of the archive.
+
+        Members are read in the order they are stored, straight from the
+        archive without writing them to disk. A member which can not be
+        read, e.g. an encrypted one, does not stop reading the others.
+
+        Args:
+            archive_path (str): A path to a zip, wheel, egg or tar archive.
+            check_size (callable): A function called with the size of a
+            member before it is decompressed, which raises an exception if
+            the member must not be read, or None.
+
+        Returns:
+            A generator of tuples of a name, such as "archive.zip!pkg/a.py",
+            a content of a member and an exception raised by "check_size" or
+            an ArchiveError. The content is None if the exception is not.
+
+        Raises:
+            ArchiveError: If the archive can not be read.
+
+    """
+
+    if archive_path.lower().endswith(ZIP_SUFFIXES):
+        sources = _iter_zip_sources(archive_path, check_size)
+    else:
+        sources = _iter_tar_sources(archive_path, check_size)
+
+    try:
+        for member_name, content, error in sources:
+            yield archive_path + MEMBER_SEPARATOR + member_name, content, \
+                error
+    except (IOError, EOFError, zlib.error, zipfile.BadZipfile,
+            zipfile.LargeZipFile, tarfile.TarError) as e:
+        raise ArchiveError('Error: archive ' + archive_path +
+                           ' can not be read: ' + str(e))
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""The module represents baselines of known issues to suppress.
+
+A baseline is a text file with a fingerprint of an issue per line. Issue
+fingerprints do not depend on positions, so a baseline keeps matching
+when the code around the issues changes. Equal issues, e.g. the same
+comparison written twice in a function, have the same fingerprint, which
+is written once per issue.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import hashlib
+import collections
+
+
+class BaselineError(Exception):
+    """The exception is raised if a baseline can not be read or written."""
+    pass
+
+
+def make_fingerprint(checker_id, qualified_name, structural_hash):
+    """Returns a fingerprint of an issue.
+
+        Args:
+            checker_id (str): An identifier of the checker raised the issue.
+            qualified_name (str): A qualified name of the function or class
+            enclosing the issue, e.g. "Class.method", or "" at module level.
+            structural_hash (str): A fingerprint of the AST of the issue.
+
+        Returns:
+            A SHA-1 hex digest as a string.
+
+    """
+
+    return hashlib.sha1(checker_id + '\0' + qualified_name + '\0' +
+                        structural_hash).hexdigest()
+
+
+class Baseline(object):
+    """The class presents fingerprints of known issues.
+
+    Known issues are found by a lookup in a dict, so the size of the
+    baseline does not slow the analysis down. A fingerprint suppresses as
+    many issues as many times it is in the baseline, so a new copy of a
+    known issue is still reported.
+
+    Attributes:
+        fingerprints (Counter): Fingerprints of the known issues mapped to
+        numbers of issues they have not suppressed yet.
+        seen_fingerprints (Counter): Fingerprints of all filtered issues,
+        known or not, mapped to numbers of the issues, to write a new
+        baseline.
+        suppressed_count (int): A number of suppressed issues.
+
+    """
+
+    def __init__(self, fingerprints=()):
+        self.fingerprints = collections.Counter(fingerprints)
+        self.seen_fingerprints = collections.Counter()
+        self.suppressed_count = 0
+
+    def filter(self, issues):
+        """Returns the issues which are not in the baseline.
+
+            Args:
+                issues (list of Issues): Issues of a file.
+
+            Returns:
+                A list of Issues.
+
+        """
+
+        fingerprints = self.fingerprints
+        new_issues = []
+        for issue in issues:
+            self.seen_fingerprints[issue.fingerprint] += 1
+            if fingerprints.get(issue.fingerprint):
+                fingerprints[issue.fingerprint] -= 1
+                self.suppressed_count += 1
+            else:
+                new_issues.append(issue)
+        return new_issues
+
+    def write(self, path):
+        """Writes sorted fingerprints of all filtered issues to the file.
+
+            A fingerprint is written once per issue.
+
+            Raises:
+                BaselineError: If the file can not be written.
+
+        """
+
+        self.seen_fingerprints.pop(None, None)
+        try:
+            with open(path, 'w') as output:
+                for fingerprint, count in sorted(
+                        self.seen_fingerprints.items()):
+                    output.write((fingerprint + '\n') * count)
+        except IOError as e:
+            raise BaselineError('Error: baseline can not be written: ' +
+                                str(e))
+
+
+def load_baseline(path):
+    """Reads a baseline written by "Baseline.write".
+
+        The file is read at once, split and counted, which takes tens of
+        milliseconds for hundreds of thousands of fingerprints.
+
+        Args:
+            path (str): A path to the baseline file.
+
+        Returns:
+            A Baseline.
+
+        Raises:
+            BaselineError: If the file can not be read.
+
+    """
+
+    try:
+        with open(path, 'r') as baseline_file:
+            return Baseline(baseline_file.read().split())
+    except IOError as e:
+        raise BaselineError('Error: baseline can not be read: ' + str(e))
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""The module represents limits of resources spent on a single file.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import copy
+import signal
+import threading
+import time
+
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024  # bytes
+DEFAULT_MAX_VERTICES = 1000000
+DEFAULT_TIME_LIMIT = 60.0  # seconds
+
+
+class BudgetExceeded(Exception):
+    """The exception is raised when the analysis of a file goes over a limit.
+
+    Its message is the reason to report the file as skipped.
+
+    """
+
+
+class DeadlineExceeded(BudgetExceeded):
+    """The exception is raised when the analysis of a file is interrupted by
+    the deadline of the run.
+
+    The file is not skipped but left for a later run.
+
+    """
+
+
+class FileBudget(object):
+    """The class presents limits of the analysis of a single file.
+
+    A limit which is None or 0 is not checked. The time limit is enforced
+    with SIGALRM, so it works only on Unix and in the main thread of a
+    process, which is where files are analysed.
+
+    Attributes:
+        max_size (int): A maximum size of a file in bytes.
+        max_vertices (int): A maximum number of vertices in the AST of a file,
+        which is checked by the Fingerprinter indexing the AST.
+        time_limit (float): A maximum time of the analysis of a file in
+        seconds.
+        deadline (float): A time in seconds since the epoch after which the
+        analysis of any file is interrupted, or None.
+
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_FILE_SIZE,
+                 max_vertices=DEFAULT_MAX_VERTICES,
+                 time_limit=DEFAULT_TIME_LIMIT, deadline=None):
+        self.max_size = max_size
+        self.max_vertices = max_vertices
+        self.time_limit = time_limit
+        self.deadline = deadline
+
+    def with_deadline(self, deadline):
+        """Returns a copy of the budget with the deadline."""
+        file_budget = copy.copy(self)
+        file_budget.deadline = deadline
+        return file_budget
+
+    def check_size(self, size):
+        """Raises BudgetExceeded if the file of the size must be skipped.
+
+            Args:
+                size (int): A size of the file in bytes.
+
+            Returns:
+                None.
+
+            Raises:
+                BudgetExceeded: If the size is over the limit.
+
+        """
+
+        if self.max_size and size > self.max_size:
+            raise BudgetExceeded('file size of %d bytes exceeds the limit of '
+                                 '%d bytes' % (size, self.max_size))
+
+    @staticmethod
+    def _can_set_alarm():
+        return hasattr(signal, 'setitimer') and \
+            isinstance(threading.current_thread(), threading._MainThread)
+
+    def call(self, function, *args):
+        """Calls the function within the time limit and before the deadline.
+
+            The alarm is set to the time limit or to the time left before
+            the deadline, whichever is shorter, so a large file does not
+            keep the run going after the deadline.
+
+            Args:
+                function (callable): A function to call.
+                args: Arguments of the function.
+
+            Returns:
+                The result of the function.
+
+            Raises:
+                BudgetExceeded: If the function runs longer than the limit.
+                DeadlineExceeded: If the deadline passes before the function
+                returns.
+
+        """
+
+        time_limit = self.time_limit
+        exception = BudgetExceeded('analysis exceeds the time limit of %g '
+                                   'seconds' % (time_limit or 0))
+        if self.deadline is not None:
+            time_left = self.deadline - time.time()
+            if time_left <= 0:
+                raise DeadlineExceeded('the deadline has passed')
+            if not time_limit or time_left < time_limit:
+                time_limit = time_left
+                exception = DeadlineExceeded('analysis is interrupted by the '
+                                             'deadline')
+        if not time_limit or not self._can_set_alarm():
+            return function(*args)
+
+        def on_alarm(signum, frame):
+            raise exception
+
+        previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+        try:
+            return function(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
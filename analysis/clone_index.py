@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""The module represents a project-wide index of statement blocks.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import array
+import heapq
+import struct
+
+import analysis.fingerprinter as fingerprinter
+
+
+def _get_hash_typecode():
+    """Returns a typecode of 8-byte unsigned array items or None."""
+    for typecode in ('Q', 'L'):
+        try:
+            if array.array(typecode).itemsize == fingerprinter.HASH_SIZE:
+                return typecode
+        except ValueError:  # "Q" is not supported by Python 2
+            pass
+    return None
+
+HASH_TYPECODE = _get_hash_typecode()
+HASH_FORMAT = '>Q'
+
+
+class CloneMember(object):
+    """The class presents a block which belongs to a clone group.
+
+    Attributes:
+        path (str): A path to the file containing the block.
+        line (int): The first line of the block.
+        column (int): A column offset of the first statement.
+        end_line (int): The last line of the block.
+        size (int): A number of AST vertices in the block.
+        block_hash (str): A fingerprint of the block.
+
+    """
+
+    __slots__ = ('path', 'line', 'column', 'end_line', 'size', 'block_hash')
+
+    def __init__(self, path, line, column, end_line, size, block_hash):
+        self.path = path
+        self.line = line
+        self.column = column
+        self.end_line = end_line
+        self.size = size
+        self.block_hash = block_hash
+
+    def contains(self, other):
+        return self.path == other.path and self.line <= other.line and \
+            other.end_line <= self.end_line
+
+
+class FileBlocks(object):
+    """The class presents blocks of a file sorted by their fingerprints.
+
+    Fingerprints are kept as 8-byte integers in arrays, so a block costs
+    a few dozens of bytes.
+
+    """
+
+    __slots__ = ('hashes', 'sizes', 'lines', 'columns', 'end_lines')
+
+    def __init__(self, blocks):
+        """FileBlocks constructor.
+
+            Args:
+                blocks (list of tuples): Blocks as tuples of a fingerprint, a
+                size, the first line, a column offset and the last line.
+
+        """
+
+        items = sorted((struct.unpack(HASH_FORMAT, block[0])[0],) + block[1:]
+                       for block in blocks)
+        hashes, sizes, lines, columns, end_lines = zip(*items)
+        self.hashes = array.array(HASH_TYPECODE, hashes) \
+            if HASH_TYPECODE is not None else list(hashes)
+        self.sizes = array.array('l', sizes)
+        self.lines = array.array('l', lines)
+        self.columns = array.array('l', columns)
+        self.end_lines = array.array('l', end_lines)
+
+
+class CloneIndex(object):
+    """The class finds equal blocks in different files of a project.
+
+    Blocks of every file are kept sorted by fingerprint, so updating a file
+    costs only sorting its own blocks, and clone groups are found by a
+    single merge of the sorted arrays of all files instead of comparing
+    blocks pairwise.
+
+    """
+
+    def __init__(self):
+        self._files = {}
+
+    def __len__(self):
+        return sum(len(blocks.hashes) for blocks in self._files.values())
+
+    def update(self, path, blocks):
+        """Replaces blocks of the file.
+
+            Args:
+                path (str): A path to the file.
+                blocks (list of tuples): Blocks as tuples of a fingerprint,
+                a size, the first line, a column offset and the last line.
+
+            Returns:
+                None.
+
+        """
+
+        if blocks:
+            self._files[path] = FileBlocks(blocks)
+        else:
+            self._files.pop(path, None)
+
+    def remove(self, path):
+        """Removes blocks of the file."""
+        self._files.pop(path, None)
+
+    def _iter_sorted_blocks(self):
+        def iter_file(path, blocks):
+            for idx, block_hash in enumerate(blocks.hashes):
+                yield block_hash, path, idx
+        return heapq.merge(*[iter_file(path, blocks) for path, blocks
+                             in sorted(self._files.items())])
+
+    def _create_member(self, path, idx):
+        blocks = self._files[path]
+        return CloneMember(path, blocks.lines[idx], blocks.columns[idx],
+                           blocks.end_lines[idx], blocks.sizes[idx],
+                           struct.pack(HASH_FORMAT, blocks.hashes[idx]))
+
+    def find_clone_groups(self):
+        """Returns groups of equal blocks found in two or more files.
+
+            Groups whose blocks are all parts of blocks of a bigger group are
+            skipped, so a cloned function is reported once rather than once
+            per its inner block.
+
+            Returns:
+                A list of lists of CloneMembers. Groups are ordered by size
+                from the biggest, and members by path and line.
+
+        """
+
+        groups = []
+        current_hash = None
+        current_group = []
+        for block_hash, path, idx in self._iter_sorted_blocks():
+            if block_hash != current_hash:
+                if len(set(member_path for member_path, _
+                           in current_group)) > 1:
+                    groups.append(current_group)
+                current_hash = block_hash
+                current_group = []
+            current_group.append((path, idx))
+        if len(set(member_path for member_path, _ in current_group)) > 1:
+            groups.append(current_group)
+
+        groups = [[self._create_member(path, idx) for path, idx in group]
+                  for group in groups]
+        groups.sort(key=lambda group: (-group[0].size, group[0].path,
+                                       group[0].line))
+
+        reported_groups = []
+        covering_members = {}
+        for group in groups:
+            if all(any(covering.contains(member) for covering
+                       in covering_members.get(member.path, ()))
+                   for member in group):
+                continue
+            reported_groups.append(group)
+            for member in group:
+                covering_members.setdefault(member.path, []).append(member)
+        return reported_groups
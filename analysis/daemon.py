@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""The module represents a daemon which keeps analysis results in memory.
+
+The daemon analyses a directory once, then finds changed files by polling
+their stat information and re-analyses only them. Clients ask it over a
+local Unix socket: a request is a JSON line, and the response is a report
+in the requested format, written until the connection is closed.
+
+Requests:
+    {"command": "analyze", "paths": [...], "format": "text"}
+        Re-checks the files if they changed and reports their issues.
+    {"command": "issues", "format": "text"}
+        Reports issues of all known files.
+    {"command": "shutdown"}
+        Stops the daemon.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import os
+import json
+import time
+import errno
+import socket
+import hashlib
+import SocketServer
+
+DEFAULT_SOCKET_PATH = '.dfast.sock'
+DEFAULT_POLL_INTERVAL = 1.0
+RECEIVE_SIZE = 65536
+REQUEST_TIMEOUT = 10.0  # seconds to receive a request or send a response
+
+
+class FileEntry(object):
+    """The class presents a known file of the daemon.
+
+    Attributes:
+        stat_key (tuple): Modification time, size and inode of the file when
+        it was analysed.
+        digest (str): A hash of the analysed content.
+        report (FileReport): Results of the analysis.
+
+    """
+
+    __slots__ = ('stat_key', 'digest', 'report')
+
+    def __init__(self, stat_key, digest, report):
+        self.stat_key = stat_key
+        self.digest = digest
+        self.report = report
+
+
+class AnalysisDaemon(object):
+    """The class keeps the file index and analysis results in memory.
+
+    Attributes:
+        source_path (str): A directory watched by the daemon.
+        poll_interval (float): Seconds between polls of the files.
+        running (bool): False after a shutdown request.
+
+    """
+
+    def __init__(self, source_path, collect_paths, check_file,
+                 reporter_classes, poll_interval=DEFAULT_POLL_INTERVAL):
+        """AnalysisDaemon constructor.
+
+            Args:
+                source_path (str): A directory to watch.
+                collect_paths (callable): A function returning paths of the
+                files to analyse in a directory.
+                check_file (callable): A function analysing a file and
+                returning its FileReport.
+                reporter_classes (dict): Names of output formats mapped to
+                reporter classes.
+                poll_interval (float): Seconds between polls of the files.
+
+        """
+
+        self.source_path = source_path
+        self.poll_interval = poll_interval
+        self.running = True
+        self._collect_paths = collect_paths
+        self._check_file = check_file
+        self._reporter_classes = reporter_classes
+        self._entries = {}
+
+    def update_file(self, path):
+        """Re-analyses the file if it changed since the last analysis.
+
+            A file whose stat information changed but whose content did not
+            is not analysed again.
+
+            Args:
+                path (str): An absolute path to the file.
+
+            Returns:
+                FileReport of the file or None if the file does not exist.
+
+        """
+
+        entry = self._entries.get(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._entries.pop(path, None)
+            return None
+
+        stat_key = (stat.st_mtime, stat.st_size, stat.st_ino)
+        if entry is not None and entry.stat_key == stat_key:
+            return entry.report
+
+        try:
+            with open(path, 'r') as source_file:
+                digest = hashlib.sha1(source_file.read()).digest()
+        except IOError:
+            self._entries.pop(path, None)
+            return None
+
+        if entry is not None and entry.digest == digest:
+            entry.stat_key = stat_key
+            return entry.report
+
+        report = self._check_file(path)
+        self._entries[path] = FileEntry(stat_key, digest, report)
+        return report
+
+    def refresh(self):
+        """Finds new, changed and removed files and updates their results."""
+        paths = set(os.path.abspath(path)
+                    for path in self._collect_paths(self.source_path))
+        for path in list(self._entries):
+            if path not in paths:
+                del self._entries[path]
+        for path in paths:
+            self.update_file(path)
+
+    def _write_report(self, reports, output_format, output):
+        reporter = self._reporter_classes[output_format](output)
+        reporter.start()
+        for report in reports:
+            reporter.report_file(report)
+        reporter.finish()
+
+    def handle_request(self, request, output):
+        """Handles a request of a client.
+
+            Args:
+                request (dict): A decoded request.
+                output (file): A stream to write the response to.
+
+            Returns:
+                None.
+
+        """
+
+        command = request.get('command')
+        output_format = request.get('format', 'text')
+        if output_format not in self._reporter_classes:
+            output.write('Error: unknown format ' + repr(output_format) + '\n')
+        elif command == 'analyze':
+            reports = []
+            for path in sorted(set(os.path.abspath(path)
+                                   for path in request.get('paths', []))):
+                report = self.update_file(path)
+                if report is not None:
+                    reports.append(report)
+            self._write_report(reports, output_format, output)
+        elif command == 'issues':
+            self.refresh()
+            self._write_report([self._entries[path].report
+                                for path in sorted(self._entries)],
+                               output_format, output)
+        elif command == 'shutdown':
+            self.running = False
+        else:
+            output.write('Error: unknown command ' + repr(command) + '\n')
+
+
+class _RequestHandler(SocketServer.StreamRequestHandler):
+
+    # a client which stops sending or reading must not block polling and
+    # other clients, as requests are handled in the polling thread
+    timeout = REQUEST_TIMEOUT
+
+    def handle(self):
+        try:
+            try:
+                request = json.loads(self.rfile.readline())
+            except ValueError:
+                self.wfile.write('Error: a request is not a JSON line\n')
+                return
+            self.server.analysis_daemon.handle_request(request, self.wfile)
+        except socket.timeout:
+            pass  # the client is dropped
+
+
+def serve(analysis_daemon, socket_path=DEFAULT_SOCKET_PATH):
+    """Runs the daemon until a shutdown request.
+
+    Requests are handled one by one in the same thread which polls the
+    files, so the results are never changed while they are reported.
+
+    Args:
+        analysis_daemon (AnalysisDaemon): The daemon to run.
+        socket_path (str): A path of the Unix socket to listen on.
+
+    Returns:
+        None.
+
+    Raises:
+        socket.error: If another daemon listens on the socket.
+
+    """
+
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except socket.error:
+            os.remove(socket_path)  # left by a daemon which was killed
+        else:
+            raise socket.error(errno.EADDRINUSE, 'Error: a daemon already '
+                                                 'listens on ' + socket_path)
+        finally:
+            probe.close()
+
+    analysis_daemon.refresh()
+
+    server = SocketServer.UnixStreamServer(socket_path, _RequestHandler)
+    server.analysis_daemon = analysis_daemon
+    server.timeout = analysis_daemon.poll_interval
+    last_refresh = time.time()
+    try:
+        while analysis_daemon.running:
+            server.handle_request()  # returns after the timeout if idle
+            if time.time() - last_refresh >= analysis_daemon.poll_interval:
+                analysis_daemon.refresh()
+                last_refresh = time.time()
+    finally:
+        server.server_close()
+        os.remove(socket_path)
+
+
+def send_request(request, output, socket_path=DEFAULT_SOCKET_PATH):
+    """Sends a request to the daemon and copies the response to the output.
+
+    Args:
+        request (dict): A request to send.
+        output (file): A stream to copy the response to.
+        socket_path (str): A path of the Unix socket of the daemon.
+
+    Returns:
+        None.
+
+    Raises:
+        socket.error: If the daemon does not listen on the socket.
+
+    """
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+        client.sendall(json.dumps(request) + '\n')
+        client.shutdown(socket.SHUT_WR)
+        data = client.recv(RECEIVE_SIZE)
+        while data:
+            output.write(data)
+            data = client.recv(RECEIVE_SIZE)
+    finally:
+        client.close()
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""The module finds source files to analyse.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import os
+import re
+import stat
+import fnmatch
+
+try:
+    from os import scandir
+except ImportError:  # Python 2 has no "os.scandir"
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+DEFAULT_INCLUDES = ('*.py',)
+DEFAULT_EXCLUDES = ('.git', '.hg', '.svn', '.tox', '.nox', '.venv', 'venv',
+                    'node_modules', '__pycache__', 'build', 'dist',
+                    '*.egg-info', '.eggs', '.dfast_cache')
+GITIGNORE_NAME = '.gitignore'
+
+
+def _translate_glob(pattern):
+    """Returns a regular expression matching paths like a gitignore glob."""
+    parts = []
+    idx = 0
+    while idx < len(pattern):
+        char = pattern[idx]
+        if pattern.startswith('**/', idx):
+            parts.append('(?:.*/)?')
+            idx += 3
+            continue
+        if pattern.startswith('**', idx):
+            parts.append('.*')
+            idx += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', idx + 1)
+            if end < 0:
+                parts.append(re.escape(char))
+            else:
+                char_class = pattern[idx + 1:end]
+                if char_class.startswith('!'):
+                    char_class = '^' + char_class[1:]
+                parts.append('[' + char_class.replace('\\', '\\\\') + ']')
+                idx = end
+        elif char == '\\' and idx + 1 < len(pattern):
+            idx += 1
+            parts.append(re.escape(pattern[idx]))
+        else:
+            parts.append(re.escape(char))
+        idx += 1
+    return re.compile(''.join(parts) + r'\Z')
+
+
+class IgnoreRule(object):
+    """The class presents a pattern of a .gitignore file.
+
+    Attributes:
+        regex (re.RegexObject): A compiled pattern.
+        negated (bool): Whether the pattern re-includes matching paths.
+        dir_only (bool): Whether the pattern matches only directories.
+        anchored (bool): Whether the pattern matches paths relative to the
+        directory of the .gitignore file rather than names at any depth.
+
+    """
+
+    __slots__ = ('regex', 'negated', 'dir_only', 'anchored')
+
+    def __init__(self, pattern):
+        self.negated = pattern.startswith('!')
+        if self.negated:
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        self.anchored = '/' in pattern
+        self.regex = _translate_glob(pattern.lstrip('/'))
+
+    def matches(self, rel_path, name, is_dir):
+        if self.dir_only and not is_dir:
+            return False
+        return self.regex.match(rel_path if self.anchored else name) is not None
+
+
+def parse_gitignore(text):
+    """Returns a list of IgnoreRules of the content of a .gitignore file."""
+    rules = []
+    for line in text.splitlines():
+        if line.endswith('\\ '):
+            line = line[:-2].rstrip() + '\\ '
+        else:
+            line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        rules.append(IgnoreRule(line))
+    return rules
+
+
+def _scan_dir(dir_path):
+    """Yields tuples of a name, a path and an "is dir" flag of entries of the
+    directory.
+
+    "os.scandir" gets entry types from the directory listing without
+    stat calls. Without it every entry costs a single "stat".
+
+    """
+
+    if scandir is not None:
+        for entry in scandir(dir_path):
+            try:
+                is_dir = entry.is_dir()
+            except OSError:  # a broken symlink
+                is_dir = False
+            yield entry.name, entry.path, is_dir
+        return
+
+    for name in os.listdir(dir_path):
+        path = os.path.join(dir_path, name)
+        try:
+            is_dir = stat.S_ISDIR(os.stat(path).st_mode)
+        except OSError:  # a broken symlink
+            is_dir = False
+        yield name, path, is_dir
+
+
+def read_file_list(stream):
+    """Yields paths of a NUL-separated list, e.g. of "find -print0".
+
+        Args:
+            stream (file): A stream to read the list from.
+
+        Returns:
+            A generator of non-empty paths.
+
+    """
+
+    pending = ''
+    while True:
+        chunk = stream.read(65536)
+        if not chunk:
+            break
+        paths = (pending + chunk).split('\0')
+        pending = paths.pop()
+        for path in paths:
+            if path:
+                yield path
+    if pending.strip('\n'):
+        yield pending.strip('\n')
+
+
+class FileDiscovery(object):
+    """The class finds source files in directory trees.
+
+    Files are yielded while directories are walked, so the analysis can
+    start before the walk ends. They are yielded in the order of their
+    sorted paths, so the order is deterministic.
+
+    Excluded and ignored directories are not entered. Symlinks to
+    directories are followed, but every directory is entered only once,
+    which breaks symlink cycles.
+
+    Attributes:
+        includes (tuple of str): Globs of names of files to analyse.
+        excludes (tuple of str): Globs of names or relative paths of files
+        and directories to skip.
+        use_gitignore (bool): Whether files ignored by .gitignore files of
+        the walked directories are skipped.
+
+    """
+
+    def __init__(self, includes=DEFAULT_INCLUDES, excludes=DEFAULT_EXCLUDES,
+                 use_gitignore=True):
+        self.includes = tuple(include.lower() for include in includes)
+        self.excludes = tuple(excludes)
+        self.use_gitignore = use_gitignore
+
+    def _is_included(self, name):
+        name = name.lower()
+        return any(fnmatch.fnmatchcase(name, include)
+                   for include in self.includes)
+
+    def _is_excluded(self, rel_path, name):
+        return any(fnmatch.fnmatchcase(name, exclude) or
+                   fnmatch.fnmatchcase(rel_path, exclude)
+                   for exclude in self.excludes)
+
+    @staticmethod
+    def _is_ignored(ignore_rules, rel_path, name, is_dir):
+        ignored = False
+        for base, rules in ignore_rules:
+            rule_path = rel_path[len(base):]
+            for rule in rules:
+                if rule.matches(rule_path, name, is_dir):
+                    ignored = not rule.negated
+        return ignored
+
+    def _open_dir(self, dir_path, rel_dir, ignore_rules, visited_dirs):
+        """Returns a frame of the walk for the directory or None if it must
+        not be walked."""
+        try:
+            dir_stat = os.stat(dir_path)
+            if (dir_stat.st_dev, dir_stat.st_ino) in visited_dirs:
+                return None
+            visited_dirs.add((dir_stat.st_dev, dir_stat.st_ino))
+            # a directory is ordered as its path with a separator, so files
+            # are yielded in the order of their sorted paths
+            entries = sorted(_scan_dir(dir_path),
+                             key=lambda entry: entry[0] + '/' if entry[2]
+                             else entry[0])
+        except OSError:
+            return None
+
+        if self.use_gitignore and \
+                any(entry[0] == GITIGNORE_NAME for entry in entries):
+            try:
+                with open(os.path.join(dir_path, GITIGNORE_NAME)) as f:
+                    rules = parse_gitignore(f.read())
+            except IOError:
+                rules = []
+            if rules:
+                ignore_rules = ignore_rules + [(rel_dir, rules)]
+        return iter(entries), rel_dir, ignore_rules
+
+    def iter_paths(self, source_path):
+        """Yields paths of source files in the directory.
+
+            Args:
+                source_path (str): A path to a directory or to a file.
+
+            Returns:
+                A generator of paths of files to analyse.
+
+        """
+
+        if not os.path.isdir(source_path):
+            if os.path.isfile(source_path):
+                yield source_path
+            return
+
+        visited_dirs = set()
+        # frames of the walk as tuples of an iterator over entries of a
+        # directory, its path relative to the source path and .gitignore
+        # rules applied to it
+        frame = self._open_dir(source_path, '', [], visited_dirs)
+        stack = [frame] if frame is not None else []
+        while stack:
+            entries, rel_dir, ignore_rules = stack[-1]
+            for name, path, is_dir in entries:
+                rel_path = rel_dir + name
+                if self._is_excluded(rel_path, name) or \
+                        self._is_ignored(ignore_rules, rel_path, name, is_dir):
+                    continue
+                if is_dir:
+                    frame = self._open_dir(path, rel_path + '/', ignore_rules,
+                                           visited_dirs)
+                    if frame is not None:
+                        stack.append(frame)
+                        break
+                elif self._is_included(name):
+                    yield path
+            else:
+                stack.pop()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""The module represents a table which dispatches AST vertices to checkers.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import ast
+
+import checkers.abstract.checker as checker
+import analysis.source_text as source_text
+
+
+def _get_ast_vertex_types():
+    """Returns all vertex types defined in the "ast" module."""
+    return [value for value in vars(ast).values()
+            if isinstance(value, type) and issubclass(value, ast.AST)]
+
+
+class DispatchTable(object):
+    """The class maps types of AST vertices to checkers which handle them.
+
+    Handlers of every vertex type are computed once, so walking a tree costs
+    a dictionary lookup per vertex plus a call per interested checker,
+    however many checkers are registered.
+
+    Attributes:
+        checkers (list of Checkers): Registered checkers.
+
+    """
+
+    def __init__(self, checker_list):
+        """DispatchTable constructor.
+
+            Args:
+                checker_list (list of Checkers): Checkers to register.
+
+            Raises:
+                TypeError: If an item of "checker_list" is not an instance of
+                "Checker".
+
+        """
+
+        for item in checker_list:
+            if not isinstance(item, checker.Checker):
+                raise TypeError('Error: an item of arg \"checker_list\" is \
+                                not an instance of \"Checker\"!')
+
+        self.checkers = list(checker_list)
+        self._handlers = {}
+
+        for vertex_type in _get_ast_vertex_types():
+            self.get_handlers(vertex_type)
+
+    def get_handlers(self, vertex_type):
+        """Returns "visit" methods of checkers which handle the vertex type.
+
+            Args:
+                vertex_type (type): A subclass of "ast.AST".
+
+            Returns:
+                A list of bound methods.
+
+        """
+
+        handlers = self._handlers.get(vertex_type)
+        if handlers is None:
+            handlers = [item.visit for item in self.checkers
+                        if issubclass(vertex_type, item.NODE_TYPES)]
+            self._handlers[vertex_type] = handlers
+        return handlers
+
+    def walk(self, ast_root, source_file):
+        """Passes every vertex of the tree to the checkers which handle it.
+
+            Args:
+                ast_root (ast.AST): A root of the tree.
+                source_file (SourceText): The file which contains the tree.
+
+            Returns:
+                None.
+
+            Raises:
+                TypeError: If arg "ast_root" is not an instance of "ast.AST".
+                TypeError: If arg "source_file" is not an instance of
+                "SourceText".
+
+        """
+
+        if not isinstance(ast_root, ast.AST):
+            raise TypeError('Error: arg \"ast_root\" is not an instance \
+                            of \"ast.AST\"!')
+        if not isinstance(source_file, source_text.SourceText):
+            raise TypeError('Error: arg \"source_file\" is not an instance \
+                            of \"SourceText\"!')
+
+        handlers_by_type = self._handlers
+        for ast_vertex in ast.walk(ast_root):
+            handlers = handlers_by_type.get(type(ast_vertex))
+            if handlers is None:
+                handlers = self.get_handlers(type(ast_vertex))
+            for handler in handlers:
+                handler(ast_vertex, source_file)
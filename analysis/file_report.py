@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""The module represents a report of analysis of a single source file.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+
+class FileReport(object):
+    """The class presents results of analysis of a single source file.
+
+    Reports contain only strings and numbers, so they are cheap to pickle
+    and can be passed from worker processes to the main one.
+
+    Attributes:
+        path (str): A path to the analysed file.
+        issues (list of Issues): Raised issues.
+        error (str): A message describing why the analysis failed or None.
+        profile (dict): A profile of the analysis or None if it is not
+        profiled.
+        blocks (list of tuples): Blocks collected for the clone index or
+        None if clones are not searched.
+        skipped (str): A reason why the file was skipped because of a
+        limit of its analysis or None.
+
+    """
+
+    def __init__(self, path, issues=None, error=None, profile=None,
+                 blocks=None, skipped=None):
+        """FileReport constructor.
+
+            Args:
+                path (str): A path to the analysed file.
+                issues (list of Issues): Raised issues.
+                error (str): A message describing why the analysis failed.
+                profile (dict): A profile of the analysis.
+                blocks (list of tuples): Blocks collected for the clone index.
+                skipped (str): A reason why the file was skipped.
+
+        """
+
+        self.path = path
+        self.issues = issues if issues is not None else []
+        self.error = error
+        self.profile = profile
+        self.blocks = blocks
+        self.skipped = skipped
+
@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+"""The module represents structural fingerprints of AST vertices.
+
+A fingerprint is a short hash of a vertex which depends only on the
+structure of its subtree (vertex types, fields and values), but not on
+positions in the source file. So equal code fragments have equal
+fingerprints.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import ast
+import hashlib
+
+import analysis.budget as budget
+
+HASH_SIZE = 8
+COMMUTATIVE_BIN_OPS = (ast.Add, ast.Mult)
+COMMUTATIVE_BIN_OPERANDS = (ast.Name, ast.Num)
+COMMUTATIVE_CMP_OPS = (ast.Eq, ast.NotEq)
+COMMUTATIVE_TYPES = (ast.BoolOp, ast.BinOp, ast.Compare, ast.Set)
+EFFECT_TYPES = (ast.Call, ast.Yield)
+
+
+def iter_child_vertices(ast_vertex):
+    """Yields direct children of the ast vertex in the fields order."""
+    for name in ast_vertex._fields:
+        value = getattr(ast_vertex, name, None)
+        if isinstance(value, ast.AST):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, ast.AST):
+                    yield item
+
+
+def get_commutative_operands(ast_vertex):
+    """Returns operands of the vertex whose order does not matter.
+
+        Operands commute in "and" and "or" operations, in "+" and "*" of
+        names and numbers, in "==" and "!=" comparisons of two operands and
+        in set literals.
+
+        Args:
+            ast_vertex (ast.AST): A vertex of AST.
+
+        Returns:
+            A tuple of names of the fields holding the operands and a list of
+            the operands, or None if the order of operands matters.
+
+    """
+
+    if isinstance(ast_vertex, ast.BoolOp):
+        return ('values',), ast_vertex.values
+    if isinstance(ast_vertex, ast.BinOp):
+        if isinstance(ast_vertex.op, COMMUTATIVE_BIN_OPS) and \
+                isinstance(ast_vertex.left, COMMUTATIVE_BIN_OPERANDS) and \
+                isinstance(ast_vertex.right, COMMUTATIVE_BIN_OPERANDS):
+            return ('left', 'right'), [ast_vertex.left, ast_vertex.right]
+    elif isinstance(ast_vertex, ast.Compare):
+        if len(ast_vertex.ops) == 1 and \
+                isinstance(ast_vertex.ops[0], COMMUTATIVE_CMP_OPS):
+            return ('left', 'comparators'), \
+                [ast_vertex.left] + ast_vertex.comparators
+    elif isinstance(ast_vertex, ast.Set):
+        return ('elts',), ast_vertex.elts
+    return None
+
+
+def are_equal_structures(ast_vertex1, ast_vertex2):
+    """Return True if the subtrees are equal field by field, False otherwise.
+
+        Positions of the vertices are ignored, as they are by "ast.dump".
+
+    """
+
+    stack = [(ast_vertex1, ast_vertex2)]
+    while stack:
+        value1, value2 = stack.pop()
+        if value1 is value2:
+            continue
+        if type(value1) is not type(value2):
+            return False
+        if isinstance(value1, ast.AST):
+            for name in value1._fields:
+                stack.append((getattr(value1, name, None),
+                              getattr(value2, name, None)))
+        elif isinstance(value1, list):
+            if len(value1) != len(value2):
+                return False
+            stack.extend(zip(value1, value2))
+        elif value1 != value2:
+            return False
+    return True
+
+
+class Fingerprinter(object):
+    """The class computes and stores fingerprints of AST vertices.
+
+    Fingerprints of a whole tree are computed bottom-up in a single pass,
+    so each vertex is serialized only once, and then reused by all
+    comparisons. Vertices with equal fingerprints are confirmed to be
+    equal by a structural comparison to rule out hash collisions.
+
+    The same pass finds the last line of every vertex, which Python 2 AST
+    does not provide, the size of every subtree and whether a subtree has
+    calls or yields.
+
+    In the normalized mode commutative operands are put in the order of
+    their fingerprints while the fingerprint of their parent is computed,
+    so e.g. "a == b" and "b == a" get equal fingerprints and are confirmed
+    to be equal by a comparison in the same order.
+
+    Attributes:
+        normalize (bool): Whether the order of commutative operands is
+        ignored.
+        max_vertices (int): A maximum number of indexed vertices, or None or
+        0 for no limit. It is checked by the same pass, so a huge tree is
+        rejected without walking it twice.
+
+    """
+
+    def __init__(self, normalize=False, max_vertices=None):
+        self.normalize = normalize
+        self.max_vertices = max_vertices
+        self._hashes = {}
+        self._end_lines = {}
+        self._sizes = {}
+        self._effects = set()  # vertices with calls or yields in subtrees
+        # commutative vertices mapped to names of their operand fields and
+        # the operands in the canonical order
+        self._canonical_operands = {}
+        self._roots = []  # keeps vertices alive, so their ids stay valid
+        self._scopes = None  # functions and classes, found on demand
+
+    def index(self, ast_root):
+        """Computes fingerprints of all vertices of the tree.
+
+            Args:
+                ast_root (ast.AST): A root of the tree.
+
+            Returns:
+                None.
+
+            Raises:
+                TypeError: If arg "ast_root" is not an instance of "ast.AST".
+                BudgetExceeded: If the number of vertices goes over
+                "max_vertices".
+
+        """
+
+        if not isinstance(ast_root, ast.AST):
+            raise TypeError('Error: arg \"ast_root\" is not an instance \
+                            of \"ast.AST\"!')
+
+        hashes = self._hashes
+        end_lines = self._end_lines
+        sizes = self._sizes
+        effects = self._effects
+        if id(ast_root) in hashes:
+            return
+        self._roots.append(ast_root)
+        self._scopes = None
+        max_vertices = self.max_vertices
+        vertex_count = len(hashes)
+
+        # an explicit stack instead of recursion: generated code may be
+        # nested deeper than the recursion limit
+        stack = [(ast_root, False)]
+        while stack:
+            ast_vertex, children_done = stack.pop()
+            if children_done:
+                hashes[id(ast_vertex)] = self._compute_hash(ast_vertex)
+                end_line = getattr(ast_vertex, 'lineno', 0)
+                size = 1
+                has_effects = isinstance(ast_vertex, EFFECT_TYPES)
+                for child in iter_child_vertices(ast_vertex):
+                    end_line = max(end_line, end_lines[id(child)])
+                    size += sizes[id(child)]
+                    if id(child) in effects:
+                        has_effects = True
+                end_lines[id(ast_vertex)] = end_line
+                sizes[id(ast_vertex)] = size
+                if has_effects:
+                    effects.add(id(ast_vertex))
+            elif id(ast_vertex) not in hashes:
+                vertex_count += 1
+                if max_vertices and vertex_count > max_vertices:
+                    raise budget.BudgetExceeded(
+                        'AST exceeds the limit of %d vertices' % max_vertices)
+                stack.append((ast_vertex, True))
+                for child in iter_child_vertices(ast_vertex):
+                    stack.append((child, False))
+
+    def _compute_hash(self, ast_vertex):
+        """Returns a fingerprint of the vertex whose children are indexed."""
+        hashes = self._hashes
+        parts = [ast_vertex.__class__.__name__]
+        operand_fields = ()
+        if self.normalize and isinstance(ast_vertex, COMMUTATIVE_TYPES):
+            commutative = get_commutative_operands(ast_vertex)
+            if commutative is not None:
+                operand_fields, operands = commutative
+                operands = sorted(operands,
+                                  key=lambda operand: hashes[id(operand)])
+                self._canonical_operands[id(ast_vertex)] = (operand_fields,
+                                                            operands)
+                parts.append('operands')
+                parts.extend(hashes[id(operand)] for operand in operands)
+
+        for name in ast_vertex._fields:
+            if name in operand_fields:
+                continue
+            value = getattr(ast_vertex, name, None)
+            parts.append(name)
+            if isinstance(value, ast.AST):
+                parts.append(hashes[id(value)])
+            elif isinstance(value, list):
+                parts.append(str(len(value)))
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        parts.append(hashes[id(item)])
+                    else:
+                        parts.append(repr(item))
+            else:
+                parts.append(repr(value))
+
+        return hashlib.md5('\0'.join(parts)).digest()[:HASH_SIZE]
+
+    @property
+    def vertex_count(self):
+        """A number of indexed vertices."""
+        return len(self._hashes)
+
+    def get_hash(self, ast_vertex):
+        """Returns a fingerprint of the vertex.
+
+            The vertex subtree is indexed first, if it has not been yet.
+
+            Args:
+                ast_vertex (ast.AST): A vertex of AST.
+
+            Returns:
+                Fingerprint of the vertex as a string of HASH_SIZE bytes.
+
+        """
+
+        fingerprint = self._hashes.get(id(ast_vertex))
+        if fingerprint is None:
+            self.index(ast_vertex)
+            fingerprint = self._hashes[id(ast_vertex)]
+        return fingerprint
+
+    def get_end_line(self, ast_vertex):
+        """Returns a number of the last line of the vertex.
+
+            It is the last line where a vertex of the subtree starts, or 0 if
+            no vertex of the subtree has a position.
+
+            Args:
+                ast_vertex (ast.AST): A vertex of AST.
+
+            Returns:
+                The line number as an int.
+
+        """
+
+        end_line = self._end_lines.get(id(ast_vertex))
+        if end_line is None:
+            self.index(ast_vertex)
+            end_line = self._end_lines[id(ast_vertex)]
+        return end_line
+
+    def get_size(self, ast_vertex):
+        """Returns a number of vertices in the subtree of the vertex."""
+        size = self._sizes.get(id(ast_vertex))
+        if size is None:
+            self.index(ast_vertex)
+            size = self._sizes[id(ast_vertex)]
+        return size
+
+    def has_effects(self, ast_vertex):
+        """Returns True if the subtree of the vertex has calls or yields,
+        whose repetition may have an effect, False otherwise."""
+        if id(ast_vertex) not in self._hashes:
+            self.index(ast_vertex)
+        return id(ast_vertex) in self._effects
+
+    def _find_scopes(self):
+        """Returns tuples of a vertex, its first and last lines and its
+        qualified name for all functions and classes sorted by lines."""
+        scopes = []
+        for ast_root in self._roots:
+            stack = [(ast_root, '')]
+            while stack:
+                ast_vertex, prefix = stack.pop()
+                if isinstance(ast_vertex, (ast.FunctionDef, ast.ClassDef)):
+                    prefix += ast_vertex.name
+                    scopes.append((ast_vertex, ast_vertex.lineno,
+                                   self.get_end_line(ast_vertex), prefix))
+                    prefix += '.'
+                children = list(iter_child_vertices(ast_vertex))
+                children.reverse()
+                stack.extend((child, prefix) for child in children)
+        scopes.sort(key=lambda scope: scope[1])  # stable: outer ones first
+        return scopes
+
+    def get_qualified_name(self, ast_vertex):
+        """Returns a qualified name of the function or class enclosing the
+        vertex.
+
+            Scopes are found by a walk of the indexed trees on the first call,
+            which is made only when an issue is raised.
+
+            Args:
+                ast_vertex (ast.AST): A vertex of AST.
+
+            Returns:
+                A name like "Class.method.function", or "" if the vertex is
+                not inside a function or a class.
+
+        """
+
+        if self._scopes is None:
+            self._scopes = self._find_scopes()
+        line = getattr(ast_vertex, 'lineno', 0)
+        qualified_name = ''
+        for scope_vertex, first_line, end_line, name in self._scopes:
+            if first_line > line:
+                break
+            if line <= end_line and scope_vertex is not ast_vertex:
+                qualified_name = name  # the innermost scope is the last one
+        return qualified_name
+
+    def get_list_hash(self, ast_vertex_list):
+        """Returns a fingerprint of a list of vertices, e.g. of a block.
+
+            Args:
+                ast_vertex_list (list): A list of AST vertices.
+
+            Returns:
+                Fingerprint of the list as a string of HASH_SIZE bytes.
+
+        """
+
+        parts = ['list', str(len(ast_vertex_list))]
+        parts.extend(self.get_hash(ast_vertex) for ast_vertex in ast_vertex_list)
+        return hashlib.md5('\0'.join(parts)).digest()[:HASH_SIZE]
+
+    def are_equal(self, ast_vertex1, ast_vertex2):
+        """Return True if the vertices are structurally equal, False otherwise.
+
+            Args:
+                ast_vertex1 (ast.AST): The first vertex of AST to compare.
+                ast_vertex2 (ast.AST): The second vertex of AST to compare.
+
+            Returns:
+                True if the vertices are equal, False otherwise.
+
+        """
+
+        if self.get_hash(ast_vertex1) != self.get_hash(ast_vertex2):
+            return False
+        return self.are_equal_structures(ast_vertex1, ast_vertex2)
+
+    def are_equal_structures(self, ast_vertex1, ast_vertex2):
+        """Return True if the subtrees are equal field by field, False
+        otherwise.
+
+            In the normalized mode commutative operands are compared in
+            their canonical order. Otherwise it is "are_equal_structures"
+            of the module.
+
+            Args:
+                ast_vertex1 (ast.AST): The first vertex of AST to compare.
+                ast_vertex2 (ast.AST): The second vertex of AST to compare.
+
+            Returns:
+                True if the vertices are equal, False otherwise.
+
+        """
+
+        if not self.normalize:
+            return are_equal_structures(ast_vertex1, ast_vertex2)
+
+        self.index(ast_vertex1)
+        self.index(ast_vertex2)
+        canonical_operands = self._canonical_operands
+        stack = [(ast_vertex1, ast_vertex2)]
+        while stack:
+            value1, value2 = stack.pop()
+            if value1 is value2:
+                continue
+            if type(value1) is not type(value2):
+                return False
+            if isinstance(value1, ast.AST):
+                operand_fields = ()
+                commutative1 = canonical_operands.get(id(value1))
+                commutative2 = canonical_operands.get(id(value2))
+                if (commutative1 is None) != (commutative2 is None):
+                    return False
+                if commutative1 is not None:
+                    operand_fields, operands1 = commutative1
+                    operands2 = commutative2[1]
+                    if len(operands1) != len(operands2):
+                        return False
+                    stack.extend(zip(operands1, operands2))
+                for name in value1._fields:
+                    if name not in operand_fields:
+                        stack.append((getattr(value1, name, None),
+                                      getattr(value2, name, None)))
+            elif isinstance(value1, list):
+                if len(value1) != len(value2):
+                    return False
+                stack.extend(zip(value1, value2))
+            elif value1 != value2:
+                return False
+        return True
+
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""The module runs commands of the local git repository.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import subprocess
+
+
+class GitError(Exception):
+    """The exception is raised if a git command fails."""
+    pass
+
+
+def run_git(args, cwd):
+    """Runs a git command and returns its output.
+
+    Args:
+        args (list of str): Arguments of the command without "git".
+        cwd (str): A directory to run the command in.
+
+    Returns:
+        Standard output of the command as a string.
+
+    Raises:
+        GitError: If git is not found or the command fails.
+
+    """
+
+    try:
+        process = subprocess.Popen(['git', '-c', 'core.quotepath=off'] + args,
+                                   cwd=cwd, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+    except OSError as e:
+        raise GitError('Error: git can not be run: ' + str(e))
+    output, errors = process.communicate()
+    if process.returncode != 0:
+        raise GitError('Error: git ' + ' '.join(args) + ' failed: ' +
+                       errors.strip())
+    return output
+
+
+def get_toplevel(path):
+    """Returns the root directory of the repository containing the path."""
+    return run_git(['rev-parse', '--show-toplevel'], path).rstrip('\n')
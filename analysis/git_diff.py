@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""The module finds lines changed since a git revision.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import os
+import re
+import sys
+import bisect
+
+import analysis.git as git
+
+HUNK_HEADER_RE = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+WHOLE_FILE = [(1, sys.maxint)]
+
+
+def _unquote_path(path):
+    """Returns a path of a diff header without the C-style quotes git puts
+    around paths with special characters, e.g. "b/na\\tme.py"."""
+    if len(path) > 1 and path.startswith('"') and path.endswith('"'):
+        return path[1:-1].decode('string_escape')
+    return path
+
+
+def _parse_diff(diff):
+    """Returns changed line ranges of files from a diff with no context.
+
+    Args:
+        diff (str): Output of "git diff --unified=0" with "a/" and "b/"
+        prefixes.
+
+    Returns:
+        A dict mapping paths relative to the repository root to sorted lists
+        of tuples of the first and the last changed line.
+
+    """
+
+    hunks = {}
+    current_hunks = None
+
+    for line in diff.splitlines():
+        if line.startswith('+++ '):
+            target = _unquote_path(line[4:].rstrip('\t'))
+            if target.startswith('b/'):
+                current_hunks = hunks.setdefault(target[2:], [])
+            else:  # "/dev/null" of a deleted file
+                current_hunks = None
+        elif line.startswith('@@') and current_hunks is not None:
+            match = HUNK_HEADER_RE.match(line)
+            if match is None:
+                continue
+            first_line = int(match.group(1))
+            count = 1 if match.group(2) is None else int(match.group(2))
+            # a removal touches the lines around it
+            last_line = first_line + count - 1 if count else first_line + 1
+            current_hunks.append((first_line, last_line))
+
+    for file_hunks in hunks.values():
+        file_hunks.sort()
+    return hunks
+
+
+def get_changed_lines(base_ref, source_path):
+    """Returns changed lines of .py files in the directory.
+
+    Files are compared between the revision and the working tree, and
+    untracked files are changed as a whole.
+
+    Args:
+        base_ref (str): A git revision to compare with.
+        source_path (str): A directory inside a git repository.
+
+    Returns:
+        A dict mapping paths of changed files, which start with
+        "source_path", to sorted lists of tuples of the first and the last
+        changed line.
+
+    Raises:
+        GitError: If a git command fails.
+
+    """
+
+    toplevel = git.get_toplevel(source_path)
+    # the prefixes are given, as diff.noprefix and diff.mnemonicPrefix of a
+    # user config change them
+    diff = git.run_git(['diff', '--no-color', '--no-ext-diff', '--unified=0',
+                        '--src-prefix=a/', '--dst-prefix=b/',
+                        '--diff-filter=ACMR', base_ref, '--', '*.py'],
+                       toplevel)
+    hunks = _parse_diff(diff)
+
+    untracked = git.run_git(['ls-files', '-z', '--others', '--exclude-standard',
+                             '--', '*.py'], toplevel)
+    for relative_path in untracked.split('\0'):
+        if relative_path:
+            hunks[relative_path] = WHOLE_FILE
+
+    source_root = os.path.realpath(source_path)
+    changed_lines = {}
+    for relative_path, file_hunks in hunks.items():
+        path = os.path.join(toplevel, *relative_path.split('/'))
+        relative_to_source = os.path.relpath(os.path.realpath(path),
+                                             source_root)
+        if relative_to_source.startswith(os.pardir + os.sep) or \
+                not os.path.isfile(path):
+            continue
+        changed_lines[os.path.join(source_path, relative_to_source)] = \
+            file_hunks
+    return changed_lines
+
+
+def is_changed(hunks, first_line, last_line):
+    """Returns True if the lines overlap a changed hunk, False otherwise.
+
+    Args:
+        hunks (list of tuples): Sorted changed line ranges of a file.
+        first_line (int): The first line of the range to check.
+        last_line (int): The last line of the range to check.
+
+    Returns:
+        True if any line of the range is changed, False otherwise.
+
+    """
+
+    # the hunk starting right before the end of the range is the only one
+    # which can overlap it, as hunks of a diff do not overlap each other
+    idx = bisect.bisect_right(hunks, (last_line, sys.maxint)) - 1
+    return idx >= 0 and hunks[idx][1] >= first_line
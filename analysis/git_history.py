@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""The module reads source files of git revisions without a checkout.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import subprocess
+
+import analysis.git as git
+
+BLOB_MODES = ('100644', '100755')  # symlinks and submodules are skipped
+
+
+class BlobOccurrence(object):
+    """The class presents a source file of a revision.
+
+    Attributes:
+        revision (str): A name of the revision as given or an abbreviated
+        commit hash.
+        path (str): A path to the file in the revision.
+        sha (str): A hash of the blob with the content of the file.
+
+    """
+
+    __slots__ = ('revision', 'path', 'sha')
+
+    def __init__(self, revision, path, sha):
+        self.revision = revision
+        self.path = path
+        self.sha = sha
+
+    @property
+    def name(self):
+        """A name of the file in reports, e.g. "v1.0:src/module.py"."""
+        return self.revision + ':' + self.path
+
+
+def get_last_commits(count, repo_path, ref='HEAD'):
+    """Returns abbreviated hashes of the last commits reachable from the ref.
+
+    Raises:
+        GitError: If a git command fails.
+
+    """
+
+    output = git.run_git(['rev-list', '--abbrev-commit',
+                          '--max-count=' + str(count), ref], repo_path)
+    return [line for line in output.split('\n') if line]
+
+
+def list_source_blobs(revision, repo_path):
+    """Returns source files of the revision.
+
+        Args:
+            revision (str): A git revision.
+            repo_path (str): A directory inside the repository.
+
+        Returns:
+            A list of BlobOccurrences of the .py files sorted by path.
+
+        Raises:
+            GitError: If a git command fails.
+
+    """
+
+    output = git.run_git(['ls-tree', '-r', '-z', '--full-tree',
+                          revision + '^{tree}'], repo_path)
+    occurrences = []
+    for entry in output.split('\0'):
+        if not entry:
+            continue
+        info, _, path = entry.partition('\t')
+        mode, object_type, sha = info.split(' ')
+        if object_type == 'blob' and mode in BLOB_MODES and \
+                path.lower().endswith('.py'):
+            occurrences.append(BlobOccurrence(revision, path, sha))
+    return occurrences
+
+
+class BlobReader(object):
+    """The class reads blobs through a single "git cat-file --batch".
+
+    Blobs are requested one by one, so the process is never blocked by a
+    full pipe, and the process is reused for all blobs.
+
+    """
+
+    def __init__(self, repo_path):
+        """BlobReader constructor.
+
+            Args:
+                repo_path (str): A directory inside the repository.
+
+            Raises:
+                GitError: If git can not be run.
+
+        """
+
+        try:
+            self._process = subprocess.Popen(
+                ['git', 'cat-file', '--batch'], cwd=repo_path,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        except OSError as e:
+            raise git.GitError('Error: git can not be run: ' + str(e))
+
+    def read(self, sha):
+        """Returns the content of the blob.
+
+            Raises:
+                GitError: If the blob can not be read.
+
+        """
+
+        self._process.stdin.write(sha + '\n')
+        self._process.stdin.flush()
+        header = self._process.stdout.readline().split()
+        if len(header) != 3 or header[1] != 'blob':
+            raise git.GitError('Error: git cat-file can not read blob ' + sha)
+        content = self._process.stdout.read(int(header[2]))
+        self._process.stdout.read(1)  # the line break after the content
+        return content
+
+    def close(self):
+        self._process.stdin.close()
+        self._process.stdout.close()
+        self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_unique_blobs(occurrences, reader):
+    """Yields tuples of a name of the first occurrence and the content of
+    every unique blob of the occurrences.
+
+    The content is None if the blob can not be read. The generator does
+    not raise, as it may be consumed by a thread of a process pool.
+
+    """
+
+    seen = set()
+    for occurrence in occurrences:
+        if occurrence.sha not in seen:
+            seen.add(occurrence.sha)
+            try:
+                content = reader.read(occurrence.sha)
+            except (git.GitError, IOError, ValueError):
+                content = None
+            yield occurrence.name, content
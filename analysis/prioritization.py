@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""The module orders files so the most relevant ones are analysed first.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import os
+
+import analysis.git as git
+
+
+def get_dirty_paths(repo_path):
+    """Returns real paths of files modified or untracked in the working tree.
+
+        Args:
+            repo_path (str): A directory inside the repository.
+
+        Returns:
+            A set of paths. It is empty if the directory is not in a git
+            repository or git can not be run.
+
+    """
+
+    try:
+        toplevel = git.get_toplevel(repo_path)
+        output = git.run_git(['status', '--porcelain', '-z',
+                              '--untracked-files=all'], repo_path)
+    except git.GitError:
+        return set()
+
+    dirty_paths = set()
+    entries = iter(output.split('\0'))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        status, path = entry[:2], entry[3:]
+        if 'R' in status or 'C' in status:
+            next(entries, None)  # the original path of a rename or a copy
+        if 'D' not in status:
+            dirty_paths.add(os.path.realpath(os.path.join(toplevel, path)))
+    return dirty_paths
+
+
+def prioritize(paths, repo_path):
+    """Returns the paths sorted by relevance.
+
+        Files modified or untracked in git come first, then files are
+        ordered by modification time, the most recent first, and then by
+        size, the smallest first, so more files are analysed in a short
+        time. Files which can not be accessed come last.
+
+        Args:
+            paths (iterable of str): Paths of files to analyse.
+            repo_path (str): A directory to find the git repository from.
+
+        Returns:
+            A list of the paths.
+
+    """
+
+    dirty_paths = get_dirty_paths(repo_path)
+
+    def get_priority(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (2, 0, 0, path)
+        is_clean = os.path.realpath(path) not in dirty_paths
+        return (int(is_clean), -stat.st_mtime, stat.st_size, path)
+
+    return sorted(paths, key=get_priority)
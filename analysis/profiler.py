@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""The module represents a profiler of the analysis hot paths.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import time
+import heapq
+
+DEFAULT_SLOWEST_COUNT = 10
+
+
+class Profiler(object):
+    """The class collects counters of the analysis.
+
+    Nothing is measured unless a profiler is created: functions are timed
+    only after they are wrapped by "wrap" or "instrument", so a run without
+    profiling pays nothing. Profiles of worker processes are passed as
+    dicts and merged into the profiler of the main process.
+
+    Attributes:
+        timings (dict): Names of timed functions mapped to lists of a number
+        of calls, total and maximum time in seconds.
+        counters (dict): Names of counters mapped to their values.
+        slowest_files (list): A heap of tuples of time in seconds, a path
+        and a number of AST vertices of the slowest files.
+        slowest_count (int): A number of the slowest files to keep.
+
+    """
+
+    def __init__(self, slowest_count=DEFAULT_SLOWEST_COUNT):
+        self.timings = {}
+        self.counters = {}
+        self.slowest_files = []
+        self.slowest_count = slowest_count
+
+    def add_time(self, name, seconds, calls=1):
+        timing = self.timings.get(name)
+        if timing is None:
+            self.timings[name] = [calls, seconds, seconds]
+        else:
+            timing[0] += calls
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_file(self, path, seconds, vertex_count):
+        """Adds a file to the slowest files, if it is slow enough."""
+        item = (seconds, path, vertex_count)
+        if len(self.slowest_files) < self.slowest_count:
+            heapq.heappush(self.slowest_files, item)
+        elif item > self.slowest_files[0]:
+            heapq.heapreplace(self.slowest_files, item)
+
+    def wrap(self, name, function):
+        """Returns the function which adds its calls to the timing "name"."""
+        def timed_function(*args, **kwargs):
+            start = time.time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add_time(name, time.time() - start)
+        return timed_function
+
+    def instrument(self, checker):
+        """Times the hot paths of the checker.
+
+            The "visit" and "_get_code_snippet" methods are timed. If the
+            checker has "_get_ast_vertex_hash" and "_are_equal_structures",
+            their calls are counted as "hash:" and "compare:", i.e. vertices
+            put into hash buckets or compared by hashes, and structural
+            comparisons confirming equal hashes.
+
+            Args:
+                checker (Checker): A checker to instrument.
+
+            Returns:
+                None.
+
+        """
+
+        checker_id = checker.CHECKER_ID
+        checker.visit = self.wrap('check:' + checker_id, checker.visit)
+        checker._get_code_snippet = self.wrap('snippet:' + checker_id,
+                                              checker._get_code_snippet)
+        if hasattr(checker, '_get_ast_vertex_hash'):
+            checker._get_ast_vertex_hash = self.wrap(
+                'hash:' + checker_id, checker._get_ast_vertex_hash)
+        if hasattr(checker, '_are_equal_structures'):
+            checker._are_equal_structures = self.wrap(
+                'compare:' + checker_id, checker._are_equal_structures)
+
+    def to_dict(self):
+        """Returns the profile as a dict which is picklable and JSON ready."""
+        return {
+            'timings': dict((name, {'calls': calls, 'total': total,
+                                    'max': maximum})
+                            for name, (calls, total, maximum)
+                            in self.timings.items()),
+            'counters': dict(self.counters),
+            'slowest_files': [{'seconds': seconds, 'path': path,
+                               'vertices': vertex_count}
+                              for seconds, path, vertex_count
+                              in sorted(self.slowest_files, reverse=True)]
+        }
+
+    def merge(self, profile):
+        """Adds a profile returned by "to_dict" to the profiler.
+
+            Args:
+                profile (dict): A profile to add.
+
+            Returns:
+                None.
+
+        """
+
+        for name, timing in profile['timings'].items():
+            self.add_time(name, timing['total'], timing['calls'])
+            self.timings[name][2] = max(self.timings[name][2],
+                                        timing['max'])
+        for name, value in profile['counters'].items():
+            self.count(name, value)
+        for item in profile['slowest_files']:
+            self.add_file(item['path'], item['seconds'], item['vertices'])
+
+    def format(self):
+        """Returns the profile as a human readable text."""
+        lines = ['%-36s %10s %12s %10s' % ('function', 'calls', 'total, s',
+                                           'max, ms')]
+        for name, (calls, total, maximum) in sorted(self.timings.items()):
+            lines.append('%-36s %10d %12.4f %10.3f' % (name, calls, total,
+                                                       maximum * 1000))
+        lines.append('')
+        for name, value in sorted(self.counters.items()):
+            lines.append('%-36s %10d' % (name, value))
+        lines.append('')
+        lines.append('slowest files:')
+        for seconds, path, vertex_count in sorted(self.slowest_files,
+                                                  reverse=True):
+            lines.append('%10.4fs %10d vertices  %s' % (seconds,
+                                                        vertex_count, path))
+        return '\n'.join(lines) + '\n'
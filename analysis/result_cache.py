@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""The module represents a persistent cache of analysis results.
+
+Results are stored in a single SQLite database and keyed by a hash of the
+file content and of the version of the checker set, so an unchanged file
+does not have to be parsed again, wherever it is located.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import os
+import sys
+import time
+import hashlib
+import sqlite3
+import cPickle as pickle
+
+CACHE_FORMAT_VERSION = '4'
+DB_FILE_NAME = 'results.sqlite'
+DEFAULT_MAX_ENTRIES = 100000
+LOCK_TIMEOUT = 30.0
+TOUCH_INTERVAL = 3600  # seconds between updates of "last_used" of an entry
+
+
+def get_checker_set_version(module_names):
+    """Returns a version of the checker set.
+
+    The version is a hash of the source code of the given modules and of all
+    loaded "checkers" modules, so it changes whenever a checker does.
+
+    Args:
+        module_names (list of str): Names of other loaded modules which
+        affect analysis results.
+
+    Returns:
+        Version as a string of hex digits.
+
+    """
+
+    names = set(module_names)
+    names.update(name for name in sys.modules
+                 if name.startswith('checkers.') and sys.modules[name])
+
+    version = hashlib.sha1(CACHE_FORMAT_VERSION)
+    for name in sorted(names):
+        module_path = getattr(sys.modules[name], '__file__', None)
+        if module_path is None:
+            continue
+        if module_path.endswith(('.pyc', '.pyo')):
+            module_path = module_path[:-1]
+        version.update(name + '\0')
+        with open(module_path, 'rb') as module_file:
+            version.update(module_file.read())
+    return version.hexdigest()
+
+
+class ResultCache(object):
+    """The class presents a persistent cache of analysis results.
+
+    Every process opens its own connection, so the cache can be shared by
+    worker processes. Any database or file system error, e.g. a cache
+    directory which can not be created, and any corrupt entry make the
+    cache behave as empty instead of failing the analysis.
+
+    Attributes:
+        cache_dir (str): A directory containing the cache database.
+        version (str): A version of the checker set.
+        max_entries (int): A maximum number of entries kept by "evict".
+
+    """
+
+    def __init__(self, cache_dir, version, max_entries=DEFAULT_MAX_ENTRIES):
+        """ResultCache constructor.
+
+            Args:
+                cache_dir (str): A directory for the cache database. It is
+                created if it does not exist.
+                version (str): A version of the checker set.
+                max_entries (int): A maximum number of entries to keep.
+
+        """
+
+        self.cache_dir = cache_dir
+        self.version = version
+        self.max_entries = max_entries
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        """Returns a connection of the current process to the database.
+
+        Raises:
+            sqlite3.Error: If the database can not be opened.
+            EnvironmentError: If the directory can not be created.
+
+        """
+
+        if self._connection is None or self._pid != os.getpid():
+            if not os.path.isdir(self.cache_dir):
+                try:
+                    os.makedirs(self.cache_dir)
+                except OSError:  # created by another process meanwhile
+                    if not os.path.isdir(self.cache_dir):
+                        raise
+            connection = sqlite3.connect(
+                os.path.join(self.cache_dir, DB_FILE_NAME),
+                timeout=LOCK_TIMEOUT)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS results ('
+                               'key TEXT PRIMARY KEY, '
+                               'result BLOB NOT NULL, '
+                               'last_used INTEGER NOT NULL)')
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _get_key(self, source):
+        return hashlib.sha1(self.version + '\0' + source).hexdigest()
+
+    def get(self, source):
+        """Returns cached results for the file content.
+
+            Args:
+                source (str): Content of a file.
+
+            Returns:
+                A tuple of a list of issues, an error message and a list of
+                blocks, or None if the content is not cached.
+
+        """
+
+        key = self._get_key(source)
+        try:
+            connection = self._connect()
+            row = connection.execute(
+                'SELECT result, last_used FROM results WHERE key = ?',
+                (key,)).fetchone()
+            if row is None:
+                return None
+            result = pickle.loads(str(row[0]))
+            now = int(time.time())
+            if now - row[1] > TOUCH_INTERVAL:
+                with connection:
+                    connection.execute(
+                        'UPDATE results SET last_used = ? WHERE key = ?',
+                        (now, key))
+        except (sqlite3.Error, EnvironmentError):
+            return None
+        except Exception:  # a corrupt entry fails to unpickle in any way
+            return None
+        return result
+
+    def put(self, source, issues, error, blocks=None):
+        """Stores results for the file content.
+
+            Args:
+                source (str): Content of a file.
+                issues (list of Issues): Issues raised in the file.
+                error (str): A message describing why the analysis failed or
+                None.
+                blocks (list of tuples): Blocks collected for the clone index
+                or None.
+
+            Returns:
+                None.
+
+        """
+
+        result = pickle.dumps((issues, error, blocks),
+                              pickle.HIGHEST_PROTOCOL)
+        try:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                    (self._get_key(source), sqlite3.Binary(result),
+                     int(time.time())))
+        except (sqlite3.Error, EnvironmentError):
+            pass
+
+    def evict(self):
+        """Removes least recently used entries above "max_entries"."""
+        try:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    'DELETE FROM results WHERE key IN ('
+                    'SELECT key FROM results ORDER BY last_used DESC '
+                    'LIMIT -1 OFFSET ?)', (self.max_entries,))
+        except (sqlite3.Error, EnvironmentError):
+            pass
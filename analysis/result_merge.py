@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""The module merges JSON Lines reports, e.g. of shards of a project.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import json
+
+import analysis.file_report as file_report
+import checkers.abstract.checker as checker
+
+
+class MergeError(Exception):
+    """The exception is raised when a report can not be read."""
+
+
+def _to_str(value):
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+def _read_issue(record):
+    issue_loc = checker.IssueLocation(_to_str(record['path']),
+                                      record['line'], record['column'],
+                                      record['end_line'])
+    return checker.Issue(issue_loc, _to_str(record['checker']),
+                         _to_str(record['message']),
+                         _to_str(record.get('snippet')),
+                         _to_str(record.get('fingerprint')))
+
+
+def merge_reports(streams):
+    """Reads JSON Lines reports and merges them.
+
+        Reports of the same file are combined and equal issues are reported
+        once, so overlapping reports may be merged as well.
+
+        Args:
+            streams (iterable of files): Streams of JSON Lines reports.
+
+        Returns:
+            A list of FileReports sorted by path with issues sorted by
+            position.
+
+        Raises:
+            MergeError: If a line is not a valid record.
+
+    """
+
+    reports = {}
+    issues = {}
+    for stream in streams:
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                path = _to_str(record['path'])
+                report = reports.get(path)
+                if report is None:
+                    report = reports[path] = file_report.FileReport(path)
+                    issues[path] = set()
+                record_type = record['type']
+                if record_type == 'issue':
+                    issues[path].add(_read_issue(record))
+                elif record_type == 'error':
+                    report.error = _to_str(record['message'])
+                elif record_type == 'skipped':
+                    report.skipped = _to_str(record['reason'])
+                else:
+                    raise ValueError('unknown type ' + repr(record_type))
+            except (ValueError, KeyError, TypeError) as e:
+                raise MergeError('Error: ' + getattr(stream, 'name', '?') +
+                                 ':' + str(line_number) +
+                                 ': not a dfast record: ' + str(e))
+
+    merged = []
+    for path in sorted(reports):
+        report = reports[path]
+        report.issues = sorted(
+            issues[path],
+            key=lambda issue: (issue.issue_loc.line, issue.issue_loc.column,
+                               issue.issue_loc.end_line, issue.checker_id,
+                               issue.explanation))
+        merged.append(report)
+    return merged
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""The module splits files into shards analysed on different machines.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import os
+import hashlib
+
+
+class Shard(object):
+    """The class presents a part of files of a project.
+
+    A file belongs to a shard by a hash of its path relative to the
+    analysed directory, so every machine assigns it to the same shard
+    wherever the project is checked out.
+
+    Attributes:
+        index (int): A number of the shard from 1 to "count".
+        count (int): A number of shards.
+
+    """
+
+    def __init__(self, index, count):
+        """Shard constructor.
+
+            Args:
+                index (int): A number of the shard from 1 to "count".
+                count (int): A number of shards.
+
+            Raises:
+                ValueError: If the numbers do not describe a shard.
+
+        """
+
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError('Error: shard ' + str(index) + '/' + str(count) +
+                             ' is not one of 1/N to N/N!')
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, text):
+        """Returns a shard described as "i/N".
+
+            Raises:
+                ValueError: If the text does not describe a shard.
+
+        """
+
+        index, _, count = text.partition('/')
+        try:
+            index, count = int(index), int(count)
+        except ValueError:
+            raise ValueError('Error: shard ' + repr(text) + ' is not "i/N"!')
+        return cls(index, count)
+
+    def __str__(self):
+        return str(self.index) + '/' + str(self.count)
+
+    def contains(self, path, base_path=None):
+        """Returns True if the file belongs to the shard, False otherwise.
+
+            Args:
+                path (str): A path to the file.
+                base_path (str): A directory the path is hashed relative to
+                or None to hash the path as it is.
+
+        """
+
+        if base_path is not None:
+            path = os.path.relpath(path, base_path)
+        key = os.path.normpath(path).replace(os.sep, '/')
+        digest = hashlib.sha1(key).hexdigest()
+        return int(digest[:8], 16) % self.count == self.index - 1
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""The module represents a source file held in memory.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+
+class SourceText(object):
+    """The class presents a source file held in memory.
+
+    The text is read once and indexed by line offsets, so any range of
+    lines is returned as a single slice.
+
+    Attributes:
+        name (str): A name of the source, usually a path to the file.
+        text (str): The source code.
+
+    """
+
+    def __init__(self, name, text):
+        """SourceText constructor.
+
+            Args:
+                name (str): A name of the source.
+                text (str): The source code.
+
+            Raises:
+                TypeError: If arg "name" or "text" is not an instance of
+                "basestring".
+
+        """
+
+        if not isinstance(name, basestring):
+            raise TypeError('Error: arg \"name\" is not an instance \
+                            of \"basestring\"!')
+        if not isinstance(text, basestring):
+            raise TypeError('Error: arg \"text\" is not an instance \
+                            of \"basestring\"!')
+
+        self.name = name
+        self.text = text
+
+        offsets = [0]
+        idx = text.find('\n')
+        while idx != -1:
+            offsets.append(idx + 1)
+            idx = text.find('\n', idx + 1)
+        if offsets[-1] != len(text):
+            offsets.append(len(text))  # the last line has no line break
+        self._line_offsets = offsets
+
+    @property
+    def line_count(self):
+        """A number of lines in the source."""
+        return len(self._line_offsets) - 1
+
+    def get_lines(self, first_line_idx, last_line_idx):
+        """Returns the lines from "first_line_idx" to "last_line_idx".
+
+            Indices are counted from 0, the last line is excluded and indices
+            out of the source are clipped.
+
+            Args:
+                first_line_idx (int): An index of the first line.
+                last_line_idx (int): An index of the line after the last one.
+
+            Returns:
+                The lines as a string including line breaks.
+
+        """
+
+        first_line_idx = min(max(first_line_idx, 0), self.line_count)
+        last_line_idx = min(max(last_line_idx, first_line_idx),
+                            self.line_count)
+        return self.text[self._line_offsets[first_line_idx]:
+                         self._line_offsets[last_line_idx]]
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""The module generates synthetic Python corpora for benchmarks.
+
+A corpus depends only on the seed and the scale, so results of different
+revisions of the tool are measured on the same code.
+
+Examples:
+        $ python -m benchmarks.corpus_generator --seed 1 --scale 2 corpusDir
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import os
+import sys
+import random
+import argparse
+
+DEFAULT_SEED = 1
+DEFAULT_SCALE = 1
+DUPLICATE_RATE = 0.05  # a share of generated operands which are repeated
+
+
+class CorpusGenerator(object):
+    """The class generates sources of synthetic Python modules.
+
+    Every kind of module stresses a different part of the tool. A small
+    share of operands, conditions and branches is repeated, so checkers
+    find issues as they do in real code.
+
+    Attributes:
+        seed (int): A seed of the random generator.
+
+    """
+
+    def __init__(self, seed=DEFAULT_SEED):
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    def _name(self):
+        return 'v%d' % self._random.randint(0, 999)
+
+    def _expression(self):
+        kind = self._random.randint(0, 2)
+        if kind == 0:
+            return self._name()
+        if kind == 1:
+            return '%s %s %d' % (self._name(),
+                                 self._random.choice(('==', '<', '!=')),
+                                 self._random.randint(0, 99))
+        return '%s(%s)' % (self._random.choice(('f', 'g', 'len')),
+                           self._name())
+
+    def _operands(self, count):
+        operands = []
+        for _ in range(count):
+            if operands and self._random.random() < DUPLICATE_RATE:
+                operands.append(self._random.choice(operands))
+            else:
+                operands.append(self._expression())
+        return operands
+
+    def _statement(self):
+        return '%s = %s' % (self._name(), self._expression())
+
+    def elif_chain(self, length):
+        """Returns a module with an if/elif ladder of the given length."""
+        conditions = self._operands(length)
+        lines = ['def dispatch(%s):' % ', '.join(
+            sorted(set(self._name() for _ in range(5))))]
+        for idx, condition in enumerate(conditions):
+            keyword = 'if' if idx == 0 else 'elif'
+            lines.append('    %s %s:' % (keyword, condition))
+            lines.append('        return %d' % self._random.randint(0, 9))
+        lines.append('    else:')
+        lines.append('        return None')
+        return '\n'.join(lines) + '\n'
+
+    def wide_bool_chain(self, width, count=10):
+        """Returns a module with boolean operations of the given width."""
+        lines = []
+        for idx in range(count):
+            operator = self._random.choice((' and ', ' or '))
+            lines.append('filter_%d = (%s)' % (
+                idx, operator.join(self._operands(width))))
+        return '\n'.join(lines) + '\n'
+
+    def deep_nesting(self, depth):
+        """Returns a module with if statements nested to the given depth."""
+        lines = ['def nested():']
+        for level in range(depth):
+            indent = '    ' * (level + 1)
+            lines.append('%sif %s:' % (indent, self._expression()))
+            lines.append('%s    %s' % (indent, self._statement()))
+        lines.append('    ' * (depth + 1) + 'pass')
+        return '\n'.join(lines) + '\n'
+
+    def huge_module(self, functions_count, body_size=20):
+        """Returns a module with many functions of if/else statements."""
+        lines = []
+        for idx in range(functions_count):
+            lines.append('def function_%d(%s):' % (idx, self._name()))
+            for _ in range(body_size // 4):
+                body = self._statement()
+                other = body if self._random.random() < DUPLICATE_RATE \
+                    else self._statement()
+                lines.append('    if %s:' % self._expression())
+                lines.append('        ' + body)
+                lines.append('    else:')
+                lines.append('        ' + other)
+            lines.append('    return %s' % self._name())
+            lines.append('')
+        return '\n'.join(lines) + '\n'
+
+    def small_module(self):
+        """Returns a short module with a couple of functions."""
+        return self.huge_module(2, body_size=8)
+
+    def generate(self, scale=DEFAULT_SCALE):
+        """Returns the corpus as a list of relative paths and sources.
+
+            Args:
+                scale (int): A multiplier of sizes and numbers of modules.
+
+            Returns:
+                A list of tuples of a relative path and a source.
+
+        """
+
+        files = []
+        for idx in range(scale):
+            files.append(('elif_chains/chain_%d.py' % idx,
+                          self.elif_chain(200 * scale)))
+            files.append(('bool_chains/chain_%d.py' % idx,
+                          self.wide_bool_chain(300 * scale)))
+            files.append(('nesting/nested_%d.py' % idx,
+                          self.deep_nesting(min(20 * scale, 90))))
+            files.append(('generated/module_%d.py' % idx,
+                          self.huge_module(500 * scale)))
+        for idx in range(500 * scale):
+            files.append(('small/package_%d/module_%d.py' % (idx % 50, idx),
+                          self.small_module()))
+        return files
+
+
+def write_corpus(corpus_dir, seed=DEFAULT_SEED, scale=DEFAULT_SCALE):
+    """Writes a generated corpus to the directory.
+
+    Args:
+        corpus_dir (str): A directory to write the corpus to.
+        seed (int): A seed of the random generator.
+        scale (int): A multiplier of sizes and numbers of modules.
+
+    Returns:
+        A number of written files.
+
+    """
+
+    files = CorpusGenerator(seed).generate(scale)
+    for relative_path, source in files:
+        path = os.path.join(corpus_dir, *relative_path.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as source_file:
+            source_file.write(source)
+    return len(files)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Generates a synthetic Python corpus.')
+    parser.add_argument('corpus_dir', help='a directory to write to')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help='a seed of the generator (default: %(default)s)')
+    parser.add_argument('--scale', type=int, default=DEFAULT_SCALE,
+                        help='a multiplier of sizes (default: %(default)s)')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    print write_corpus(args.corpus_dir, args.seed, args.scale), 'files'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""The module measures time and memory of every phase of the analysis.
+
+The runner generates a corpus (or takes an existing directory), runs the
+phases of the analysis one after another and writes the results as JSON.
+Results of two revisions can be compared, and the comparison fails if a
+phase became slower than the allowed ratio.
+
+Examples:
+        $ python -m benchmarks.runner -o new.json
+        $ python -m benchmarks.runner -o new.json --compare old.json
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import os
+import sys
+import ast
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+from StringIO import StringIO
+
+import dfast
+import analysis.dispatch_table as dispatch_table
+import analysis.file_report as file_report
+import analysis.fingerprinter as fingerprinter
+import analysis.source_text as source_text
+import benchmarks.corpus_generator as corpus_generator
+import reporters.text_reporter as text_reporter
+
+DEFAULT_REPEAT = 3
+DEFAULT_MAX_RATIO = 1.2
+MIN_COMPARED_SECONDS = 0.01  # faster phases are too noisy to compare
+
+
+def _get_peak_rss_kb(phases):
+    """Returns the peak resident memory of the whole process in KB.
+
+    Resets of the peak of phases reset the peak known to "getrusage" as
+    well, so it is the highest peak of the phases if they are known.
+
+    """
+
+    phase_peaks = [result['peak_rss_kb'] for result in phases.values()
+                   if result['peak_rss_kb'] is not None]
+    if phase_peaks:
+        return max(phase_peaks)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _reset_peak_rss():
+    """Resets the peak resident memory of the process to the current one.
+
+    Returns:
+        True if the peak is reset, False if it can not be, as on systems
+        without /proc/self/clear_refs.
+
+    """
+
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except IOError:
+        return False
+
+
+def _get_reset_peak_rss_kb():
+    """Returns the peak resident memory of the process since the last
+    "_reset_peak_rss" in KB, or None if it is not known."""
+    try:
+        with open('/proc/self/status', 'r') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except (IOError, IndexError, ValueError):
+        pass
+    return None
+
+
+def _get_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'],
+            cwd=os.path.dirname(os.path.abspath(dfast.__file__)),
+            stderr=open(os.devnull, 'w')).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class PhaseTimer(object):
+    """The class accumulates time spent in phases of the analysis.
+
+    The peak memory of a phase is measured by resetting the peak resident
+    memory of the process, which is kept by Linux in VmHWM of
+    /proc/self/status, at the start of the phase and reading it at the end.
+
+    Attributes:
+        phases (dict): Phase names mapped to dicts with "seconds" and
+        "peak_rss_kb", which is the peak resident memory of the process
+        during the phase, or None if it is not known.
+
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._peak_reset = False
+
+    def start(self):
+        """Starts a phase and returns its start time for "stop"."""
+        self._peak_reset = _reset_peak_rss()
+        return time.time()
+
+    def stop(self, phase, start, excluded_seconds=0.0):
+        """Adds the time since "start", except "excluded_seconds", and the
+        peak memory since "start" to the phase."""
+        seconds = time.time() - start - excluded_seconds
+        peak_rss = _get_reset_peak_rss_kb() if self._peak_reset else None
+        self.add(phase, seconds)
+        phase_result = self.phases[phase]
+        if peak_rss is not None:
+            phase_result['peak_rss_kb'] = max(phase_result['peak_rss_kb'],
+                                              peak_rss)
+
+    def add(self, phase, seconds):
+        """Adds the time to the phase."""
+        phase_result = self.phases.setdefault(phase, {'seconds': 0.0,
+                                                      'peak_rss_kb': None})
+        phase_result['seconds'] += seconds
+
+    def wrap(self, phase, function):
+        """Returns the function which adds its run time to the phase.
+
+        The memory is not measured, as the function runs inside another
+        phase, whose peak must not be reset.
+
+        """
+        def timed_function(*args, **kwargs):
+            start = time.time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(phase, time.time() - start)
+        return timed_function
+
+
+def run_phases(corpus_dir):
+    """Runs the phases of the analysis of the corpus once.
+
+    Args:
+        corpus_dir (str): A directory with the corpus.
+
+    Returns:
+        A tuple of a dict mapping phase names to their results and a dict
+        with numbers of analysed files and raised issues.
+
+    """
+
+    timer = PhaseTimer()
+
+    start = timer.start()
+    paths = dfast.collect_paths(corpus_dir)
+    timer.stop('discovery', start)
+
+    start = timer.start()
+    sources = []
+    for path in paths:
+        with open(path, 'r') as source_file:
+            sources.append(source_text.SourceText(path, source_file.read()))
+    timer.stop('read', start)
+
+    start = timer.start()
+    trees = [ast.parse(source.text) for source in sources]
+    timer.stop('parse', start)
+
+    start = timer.start()
+    fingerprinters = []
+    for tree in trees:
+        fingerprinters.append(fingerprinter.Fingerprinter())
+        fingerprinters[-1].index(tree)
+    timer.stop('fingerprint', start)
+
+    checkers = dfast.create_checkers()
+    for checker in checkers:
+        checker._get_code_snippet = timer.wrap('snippets',
+                                               checker._get_code_snippet)
+
+    # every checker walks the trees alone, so its time is measured apart
+    for checker in checkers:
+        table = dispatch_table.DispatchTable([checker])
+        start = timer.start()
+        snippets_before = timer.phases.get('snippets', {}).get('seconds', 0)
+        for tree, source, tree_fingerprinter in \
+                zip(trees, sources, fingerprinters):
+            checker.prepare(tree_fingerprinter)
+            table.walk(tree, source)
+        snippets_time = timer.phases.get('snippets', {}).get('seconds', 0) - \
+            snippets_before
+        timer.stop('checker:' + checker.CHECKER_ID, start, snippets_time)
+
+    start = timer.start()
+    reporter = text_reporter.TextReporter(StringIO())
+    reporter.start()
+    issues_by_path = {}
+    for checker in checkers:
+        for issue in checker.statistics.raised_issues:
+            issues_by_path.setdefault(issue.issue_loc.path, []).append(issue)
+    for source in sources:
+        reporter.report_file(file_report.FileReport(
+            source.name, issues_by_path.get(source.name, [])))
+    reporter.finish()
+    timer.stop('output', start)
+
+    counts = {'files': len(paths), 'issues': reporter.issues_count}
+    return timer.phases, counts
+
+
+def run(corpus_dir, repeat=DEFAULT_REPEAT):
+    """Runs the phases several times and keeps the fastest time and the
+    highest peak memory of each.
+
+    Args:
+        corpus_dir (str): A directory with the corpus.
+        repeat (int): A number of runs.
+
+    Returns:
+        A tuple of a dict mapping phase names to their results and a dict
+        with numbers of analysed files and raised issues.
+
+    """
+
+    best = None
+    for _ in range(repeat):
+        phases, counts = run_phases(corpus_dir)
+        if best is None:
+            best = phases
+            continue
+        for name, result in phases.items():
+            if result['seconds'] < best[name]['seconds']:
+                best[name]['seconds'] = result['seconds']
+            best[name]['peak_rss_kb'] = max(best[name]['peak_rss_kb'],
+                                            result['peak_rss_kb'])
+    return best, counts
+
+
+def compare(old_results, new_results, max_ratio=DEFAULT_MAX_RATIO):
+    """Compares results of two revisions.
+
+    Args:
+        old_results (dict): Results of the baseline revision.
+        new_results (dict): Results of the new revision.
+        max_ratio (float): A maximum allowed ratio of new and old times.
+
+    Returns:
+        A tuple of lines of a text report and a list of regressed phases.
+
+    """
+
+    lines = []
+    regressions = []
+    old_phases = old_results['phases']
+    for name, result in sorted(new_results['phases'].items()):
+        if name not in old_phases:
+            continue
+        old_seconds = old_phases[name]['seconds']
+        new_seconds = result['seconds']
+        ratio = new_seconds / old_seconds if old_seconds else 1.0
+        lines.append('%-32s %9.4fs %9.4fs %6.2fx' % (name, old_seconds,
+                                                     new_seconds, ratio))
+        if ratio > max_ratio and new_seconds >= MIN_COMPARED_SECONDS:
+            regressions.append(name)
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Measures time and memory of the analysis phases.')
+    parser.add_argument('--corpus-dir',
+                        help='an existing corpus (default: a generated one)')
+    parser.add_argument('--seed', type=int,
+                        default=corpus_generator.DEFAULT_SEED,
+                        help='a seed of the generated corpus')
+    parser.add_argument('--scale', type=int,
+                        default=corpus_generator.DEFAULT_SCALE,
+                        help='a scale of the generated corpus')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='a number of runs (default: %(default)s)')
+    parser.add_argument('-o', '--output', help='a file to write results to')
+    parser.add_argument('--compare', metavar='RESULTS',
+                        help='results of another revision to compare with')
+    parser.add_argument('--max-ratio', type=float, default=DEFAULT_MAX_RATIO,
+                        help='a slowdown which fails the comparison '
+                             '(default: %(default)s)')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    corpus_dir = args.corpus_dir
+    if corpus_dir is None:
+        corpus_dir = tempfile.mkdtemp(prefix='dfast_corpus_')
+        corpus_generator.write_corpus(corpus_dir, args.seed, args.scale)
+    try:
+        phases, counts = run(corpus_dir, args.repeat)
+    finally:
+        if args.corpus_dir is None:
+            shutil.rmtree(corpus_dir)
+
+    results = {
+        'revision': _get_revision(),
+        'python': platform.python_version(),
+        'corpus': {'dir': args.corpus_dir, 'seed': args.seed,
+                   'scale': args.scale},
+        'repeat': args.repeat,
+        'counts': counts,
+        'phases': phases,
+        'peak_rss_kb': _get_peak_rss_kb(phases)
+    }
+
+    print '%(files)d files, %(issues)d issues' % counts
+    print '%-32s %10s %13s' % ('phase', 'time', 'peak RSS')
+    for name, result in sorted(phases.items()):
+        peak_rss = result['peak_rss_kb']
+        print '%-32s %9.4fs %10s KB' % (name, result['seconds'],
+                                        '?' if peak_rss is None
+                                        else '%d' % peak_rss)
+    print 'peak RSS of the process: %d KB' % results['peak_rss_kb']
+
+    if args.output is not None:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as old_output:
+            lines, regressions = compare(json.load(old_output), results,
+                                         args.max_ratio)
+        print
+        print '\n'.join(lines)
+        if regressions:
+            print 'Regressions:', ', '.join(regressions)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
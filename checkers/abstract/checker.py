@@ -20,92 +20,181 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import ast
 from abc import ABCMeta, abstractmethod
 
+import analysis.baseline as baseline
+import analysis.fingerprinter as fingerprinter
+import analysis.source_text as source_text
+
 
 class IssueLocation(object):
     """The class presents information about detected issue location.
 
+    Locations are immutable values, which can be compared and hashed.
+
     Attributes:
-        source_file (file): A source_file containing the issue.
-        ast_vertex (ast.AST): ast vertex from the file.
+        path (str): A path to the file containing the issue.
+        line (int): A number of the first line of the issue.
+        column (int): A column offset of the issue in the first line.
+        end_line (int): A number of the last line of the issue.
 
     """
 
-    def __init__(self, ast_vertex, source_file):
+    __slots__ = ('path', 'line', 'column', 'end_line')
+
+    def __init__(self, path, line, column, end_line):
         """IssueLocation constructor.
 
             Args:
-                source_file (file): A source_file to file containing the issue.
-                ast_vertex (ast.AST): Line number in the file.
+                path (str): A path to the file containing the issue.
+                line (int): A number of the first line of the issue.
+                column (int): A column offset of the issue.
+                end_line (int): A number of the last line of the issue.
 
             Raises:
-                TypeError: If arg "source_file" is not an instance of "file".
-                TypeError: If arg "ast_vertex" is not an instance of "ast.AST".
+                TypeError: If arg "path" is not an instance of "basestring".
+                TypeError: If arg "line", "column" or "end_line" is not an
+                instance of "int".
 
         """
 
-        if isinstance(source_file, file):
-            self.source_file = source_file
-        else:
-            raise TypeError('Error: arg \"source_file\" is not an instance of \
-                    \"file\"!')
-        if isinstance(ast_vertex, ast.AST):
-            self.ast_vertex = ast_vertex
-        else:
-            raise TypeError('Error: arg \"ast_vertex\" is not an instance of \
-                    \"ast.AST\"!')
+        if not isinstance(path, basestring):
+            raise TypeError('Error: arg \"path\" is not an instance of \
+                    \"basestring\"!')
+        for arg in (line, column, end_line):
+            if not isinstance(arg, int):
+                raise TypeError('Error: arg \"line\", \"column\" or \
+                        \"end_line\" is not an instance of \"int\"!')
+
+        self.path = path
+        self.line = line
+        self.column = column
+        self.end_line = end_line
+
+    def _get_key(self):
+        return self.path, self.line, self.column, self.end_line
+
+    def __reduce__(self):
+        return IssueLocation, self._get_key()
+
+    def __eq__(self, other):
+        return isinstance(other, IssueLocation) and \
+            self._get_key() == other._get_key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._get_key())
 
 
 class Issue(object):
     """The class presents information about detected issue.
 
+    Issues are immutable values holding no references to files or ASTs, so
+    they are cheap to keep, to pickle and to compare.
+
     Attributes:
         issue_loc (IssueLocation): Location info.
+        checker_id (str): An identifier of the checker raised the issue.
         explanation (str): Text explanation for the issue.
-        code_snippet (str): Code snippet of the issue.
+        code_snippet (str): Code snippet of the issue or None if snippets
+        are not rendered.
+        fingerprint (str): A key of the issue independent of its position,
+        as made by "baseline.make_fingerprint", or None if it is unknown.
 
     """
 
-    def __init__(self, issue_loc, explanation, code_snippet):
+    __slots__ = ('issue_loc', 'checker_id', 'explanation', 'code_snippet',
+                 'fingerprint')
+
+    def __init__(self, issue_loc, checker_id, explanation, code_snippet=None,
+                 fingerprint=None):
         """Issue constructor.
 
             Args:
                 issue_loc (IssueLocation): Location info.
+                checker_id (str): An identifier of the checker.
                 explanation (str): Text explanation for the issue.
-                code_snippet (str): Code snippet of the issue.
+                code_snippet (str): Code snippet of the issue or None.
+                fingerprint (str): A key of the issue or None.
 
             Raises:
                 TypeError: If arg "issue_loc" is not an instance of
                 "IssueLocation".
-                TypeError: If arg "explanation" is not an instance of "str".
-                TypeError: If arg "code_snippet" is not an instance of "str".
+                TypeError: If arg "checker_id" is not an instance of "str".
+                TypeError: If arg "explanation" is not an instance of
+                "basestring".
+                TypeError: If arg "code_snippet" is neither an instance of
+                "basestring" nor None.
+                TypeError: If arg "fingerprint" is neither an instance of
+                "str" nor None.
 
         """
 
-        if isinstance(issue_loc, IssueLocation):
-            self.issue_loc = issue_loc
-        else:
+        if not isinstance(issue_loc, IssueLocation):
             raise TypeError('Error: arg \"issue_loc\" is not an instance of \
                     \"IssueLocation\"!')
-        if isinstance(explanation, str):
-            self.explanation = explanation
-        else:
-            raise TypeError('Error: arg \"explanation\" is not an instance of \
+        if not isinstance(checker_id, str):
+            raise TypeError('Error: arg \"checker_id\" is not an instance of \
                     \"str\"!')
-        if isinstance(code_snippet, str):
-            self.code_snippet = code_snippet
-        else:
+        if not isinstance(explanation, basestring):
+            raise TypeError('Error: arg \"explanation\" is not an instance of \
+                    \"basestring\"!')
+        if code_snippet is not None and \
+                not isinstance(code_snippet, basestring):
             raise TypeError('Error: arg \"code_snippet\" is not an instance \
+                            of \"basestring\"!')
+        if fingerprint is not None and not isinstance(fingerprint, str):
+            raise TypeError('Error: arg \"fingerprint\" is not an instance \
                             of \"str\"!')
 
+        self.issue_loc = issue_loc
+        self.checker_id = checker_id
+        self.explanation = explanation
+        self.code_snippet = code_snippet
+        self.fingerprint = fingerprint
+
+    def _get_key(self):
+        return (self.issue_loc, self.checker_id, self.explanation,
+                self.code_snippet, self.fingerprint)
+
+    def __reduce__(self):
+        return Issue, self._get_key()
+
+    def __eq__(self, other):
+        return isinstance(other, Issue) and self._get_key() == other._get_key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._get_key())
+
+    def relocated(self, path):
+        """Returns a copy of the issue located in another file.
+
+            Args:
+                path (str): A path to the other file.
+
+            Returns:
+                Issue with the same position in the file at "path".
+
+        """
+
+        issue_loc = IssueLocation(path, self.issue_loc.line,
+                                  self.issue_loc.column,
+                                  self.issue_loc.end_line)
+        return Issue(issue_loc, self.checker_id, self.explanation,
+                     self.code_snippet, self.fingerprint)
+
     @property
     def description(self):
         """Issue text description."""
-        description = self.issue_loc.source_file.name + ':' + \
-                      str(self.issue_loc.ast_vertex.lineno) + ':' + \
-                      str(self.issue_loc.ast_vertex.col_offset) + ': ' + \
-                      'error: ' + self.explanation + '\n' + \
-                      self.code_snippet
-
+        description = self.issue_loc.path + ':' + \
+            str(self.issue_loc.line) + ':' + \
+            str(self.issue_loc.column) + ': ' + \
+            'error: ' + self.explanation
+        if self.code_snippet:
+            description += '\n' + self.code_snippet
         return description
 
 
@@ -140,18 +229,67 @@ class Statistics(object):
             raise TypeError('Error: arg \"issue\" is not an instance \
                             of \"Issue\"!')
 
+    def pop_issues(self):
+        """Returns the raised issues and removes them from the statistics.
+
+        A checker reused for many sources keeps only the issues of the
+        current one.
+
+        Returns:
+            A list of Issues.
+
+        """
+
+        issues = self.raised_issues
+        self.raised_issues = []
+        return issues
+
 
 class Checker(object):
     """The class presents an abstract checker.
 
     Attributes:
+        CHECKER_ID (str): A stable identifier of the checker in reports. A
+        checker with several rules reports some of them with identifiers of
+        their own.
+        NODE_TYPES (tuple): Types of AST vertices the checker handles.
         statistics (Statistics): A statistics of using of the checker.
+        fingerprinter (Fingerprinter): Structural hashes of AST vertices.
+        render_snippets (bool): Whether code snippets of raised issues are
+        built. It is turned off by the --no-snippets option and by the
+        flake8 plugin, which prints no snippets.
 
     """
 
+    CHECKER_ID = None
+    NODE_TYPES = ()
+
     def __init__(self):
         """Checker constructor. It initialises a statistics of the checker."""
         self.statistics = Statistics()
+        self.fingerprinter = fingerprinter.Fingerprinter()
+        self.render_snippets = True
+
+    def prepare(self, file_fingerprinter):
+        """Prepares the checker to check vertices of a new file.
+
+        Args:
+            file_fingerprinter (Fingerprinter): Structural hashes of the file
+            AST shared by all checkers.
+
+        Returns:
+            None.
+
+        Raises:
+            TypeError: If arg "file_fingerprinter" is not an instance of
+            "Fingerprinter".
+
+        """
+
+        if not isinstance(file_fingerprinter, fingerprinter.Fingerprinter):
+            raise TypeError('Error: arg \"file_fingerprinter\" is not an \
+                            instance of \"Fingerprinter\"!')
+        self.fingerprinter = file_fingerprinter
 
     __metaclass__ = ABCMeta
 
@@ -161,55 +299,103 @@ class Checker(object):
 
         Args:
             ast_vertex (ast.AST): Given ast vertex.
-            source_file (file): The file which contains the ast vertex.
+            source_file (SourceText): The file which contains the ast vertex.
 
         Returns:
             Code snippet as a string.
 
         Raises:
             TypeError: If arg "ast_vertex" is not an instance of "ast.AST".
-            TypeError: If arg "source_file" is not an instance of "file".
-            ValueError: If "source_file" is closed.
+            TypeError: If arg "source_file" is not an instance of
+            "SourceText".
 
         """
         if not isinstance(ast_vertex, ast.AST):
             raise TypeError('Error: arg \"ast_vertex\" is not an instance \
                             of \"ast.AST\"!')
-        if not isinstance(source_file, file):
+        if not isinstance(source_file, source_text.SourceText):
             raise TypeError('Error: arg \"source_file\" is not an instance \
-                            of \"file\"!')
+                            of \"SourceText\"!')
 
-    def raise_issue(self, ast_vertex, source_file, err_msg):
-        """Adds an issue to the class statistics."""
+    def raise_issue(self, ast_vertex, source_file, err_msg, rule_id=None):
+        """Adds an issue to the class statistics.
 
-        issue_loc = IssueLocation(ast_vertex, source_file)
-        code_snippet = self._get_code_snippet(ast_vertex, source_file)
-        issue = Issue(issue_loc, err_msg, code_snippet)
+        A code snippet is built only if "render_snippets" is set. The
+        fingerprint of the issue is made of the rule identifier, the
+        qualified name of the enclosing function and the fingerprint of the
+        vertex.
+
+        Args:
+            ast_vertex (ast.AST): The vertex of the issue.
+            source_file (SourceText): The file which contains the vertex.
+            err_msg (str): An explanation of the issue.
+            rule_id (str): An identifier of the rule in reports, or None for
+            "CHECKER_ID".
+
+        """
+
+        if rule_id is None:
+            rule_id = self.CHECKER_ID
+
+        issue_loc = IssueLocation(source_file.name, ast_vertex.lineno,
+                                  ast_vertex.col_offset,
+                                  self.fingerprinter.get_end_line(ast_vertex))
+        code_snippet = None
+        if self.render_snippets:
+            code_snippet = self._get_code_snippet(ast_vertex, source_file)
+        fingerprint = baseline.make_fingerprint(
+            rule_id,
+            self.fingerprinter.get_qualified_name(ast_vertex),
+            self.fingerprinter.get_hash(ast_vertex))
+        issue = Issue(issue_loc, rule_id, err_msg, code_snippet, fingerprint)
 
         self.statistics.add_issue(issue)
 
-    @abstractmethod
     def check(self, ast_vertex, source_file):
         """Checks the "ast_vertex" and add a new issue to the statistics,
         if a problem is found.
 
         Args:
             ast_vertex (ast.AST): A vertex of AST to check.
-            source_file (file): The file which contains the "ast_vertex".
+            source_file (SourceText): The file which contains the
+            "ast_vertex".
 
         Returns:
             True if an issue was detected by the checker, False otherwise.
 
         Raises:
             TypeError: If arg "ast_vertex" is not an instance of "ast.AST".
-            TypeError: If arg "source_file" is not an instance of "file".
-            ValueError: If "source_file" is closed.
+            TypeError: If arg "source_file" is not an instance of
+            "SourceText".
 
         """
 
         if not isinstance(ast_vertex, ast.AST):
             raise TypeError('Error: arg \"ast_vertex\" is not an instance \
                             of \"ast.AST\"!')
-        if not isinstance(source_file, file):
+        if not isinstance(source_file, source_text.SourceText):
             raise TypeError('Error: arg \"source_file\" is not an instance \
-                            of \"file\"!')
+                            of \"SourceText\"!')
+
+        if isinstance(ast_vertex, self.NODE_TYPES):
+            return self.visit(ast_vertex, source_file)
+        return False
+
+    @abstractmethod
+    def visit(self, ast_vertex, source_file):
+        """Checks the "ast_vertex" of one of "NODE_TYPES" and add a new issue
+        to the statistics, if a problem is found.
+
+        Unlike "check", the method does not validate its arguments, so the
+        walker calls it for every vertex of a matching type after validating
+        the file once.
+
+        Args:
+            ast_vertex (ast.AST): A vertex of AST to check.
+            source_file (SourceText): The file which contains the
+            "ast_vertex".
+
+        Returns:
+            True if an issue was detected by the checker, False otherwise.
+
+        """
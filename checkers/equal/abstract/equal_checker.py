@@ -43,36 +43,33 @@ class EqualChecker(checkers.abstract.checker.Checker):
 
             Args:
                 ast_vertex (ast.AST): A vertex of AST for hash generation.
-                source_file (file): A source file which contains the vertex.
+                source_file (SourceText): A source file which contains the
+                vertex.
 
             Returns:
                 Code snippet as a string.
 
             Raises:
                 TypeError: If arg "ast_vertex" is not an instance of "ast.AST".
-                TypeError: If arg "source_file" is not an instance of "file".
-                ValueError: If "source_file" is closed.
+                TypeError: If arg "source_file" is not an instance of
+                "SourceText".
 
         """
 
         super(EqualChecker, self)._get_code_snippet(ast_vertex, source_file)
 
-        snippet = ''
         first_line_idx = ast_vertex.lineno - self.SNIPPET_RADIUS - 1
         last_line_idx = ast_vertex.lineno + self.SNIPPET_RADIUS - 1
 
-        source_file.seek(0)
-
-        lines = source_file.readlines()
-
-        for i in range(first_line_idx, last_line_idx):
-            snippet += lines[i]
-        return snippet
+        return source_file.get_lines(first_line_idx, last_line_idx)
 
     @staticmethod
-    def __get_ast_vertex_hash(self, ast_vertex):  # TODO: Bullshit!!!
+    def _get_ast_vertex_hash(self, ast_vertex):
         """Return a hash of the ast vertex as a string.
 
+            Hashes are taken from the fingerprinter, so a subtree is
+            serialized only once per file however many times it is compared.
+
             Args:
                 ast_vertex (ast.AST): A vertex of AST for hash generation.
 
@@ -88,7 +85,20 @@ class EqualChecker(checkers.abstract.checker.Checker):
             raise TypeError('Error: arg \"ast_vertex\" is not an instance \
                             of \"ast.AST\"!')
 
-        return ast.dump(ast_vertex)
+        return self.fingerprinter.get_hash(ast_vertex)
+
+    @staticmethod
+    def _are_equal_structures(self, ast_vertex1, ast_vertex2):
+        """Return True if the vertices with equal hashes are equal field by
+        field, False otherwise.
+
+            All comparisons of vertices end here, so a profiler counts them
+            by wrapping the method.
+
+        """
+
+        return self.fingerprinter.are_equal_structures(ast_vertex1,
+                                                       ast_vertex2)
 
     @staticmethod
     def _are_equal_ast_vertices(self, ast_vertex1, ast_vertex2):
@@ -114,9 +124,10 @@ class EqualChecker(checkers.abstract.checker.Checker):
             raise TypeError('Error: arg \"ast_vertex2\" is not an instance \
                             of \"ast.AST\"!')
 
-        if self.__get_ast_vertex_hash(self, ast_vertex1) == \
-                self.__get_ast_vertex_hash(self, ast_vertex2):
-            return True
+        if self._get_ast_vertex_hash(self, ast_vertex1) == \
+                self._get_ast_vertex_hash(self, ast_vertex2):
+            # equal hashes are confirmed to rule out a collision
+            return self._are_equal_structures(self, ast_vertex1, ast_vertex2)
         else:
             return False
 
@@ -156,3 +167,133 @@ class EqualChecker(checkers.abstract.checker.Checker):
             return True
         else:
             return False
+
+    @staticmethod
+    def _group_equal_ast_vertices(self, ast_vertex_list):
+        """Return groups of equal vertices of the list.
+
+            Vertices are put into buckets by their hashes in a single pass,
+            so all groups are found in linear time instead of comparing every
+            pair of vertices.
+
+            Args:
+                ast_vertex_list (list): A list of AST vertices to group.
+
+            Returns:
+                A list of groups of two or more equal vertices ordered by
+                their first occurrence. A group is a list of indices of the
+                vertices in "ast_vertex_list".
+
+            Raises:
+                TypeError: If arg "ast_vertex_list" is not an instance of
+                "list".
+
+        """
+
+        if not isinstance(ast_vertex_list, list):
+            raise TypeError('Error: arg \"ast_vertex_list\" is not \
+                             an instance of \"list\"!')
+
+        buckets = {}
+        groups = []
+
+        for idx, ast_vertex in enumerate(ast_vertex_list):
+            bucket = buckets.setdefault(
+                self._get_ast_vertex_hash(self, ast_vertex), [])
+            for group in bucket:  # more than one group only on collisions
+                if self._are_equal_structures(
+                        self, ast_vertex_list[group[0]], ast_vertex):
+                    group.append(idx)
+                    break
+            else:
+                group = [idx]
+                bucket.append(group)
+                groups.append(group)
+
+        return [group for group in groups if len(group) > 1]
+
+    @staticmethod
+    def _group_equal_lists_of_ast(self, ast_vertex_lists):
+        """Return groups of equal lists of ast vertices, e.g. of blocks.
+
+            Lists are put into buckets by their fingerprints in a single
+            pass, like vertices in "_group_equal_ast_vertices".
+
+            Args:
+                ast_vertex_lists (list): A list of lists of AST vertices.
+
+            Returns:
+                A list of groups of two or more equal lists ordered by their
+                first occurrence. A group is a list of indices of the lists in
+                "ast_vertex_lists".
+
+            Raises:
+                TypeError: If arg "ast_vertex_lists" is not an instance of
+                "list".
+
+        """
+
+        if not isinstance(ast_vertex_lists, list):
+            raise TypeError('Error: arg \"ast_vertex_lists\" is not \
+                             an instance of \"list\"!')
+
+        buckets = {}
+        groups = []
+
+        for idx, ast_vertex_list in enumerate(ast_vertex_lists):
+            bucket = buckets.setdefault(
+                self.fingerprinter.get_list_hash(ast_vertex_list), [])
+            for group in bucket:  # more than one group only on collisions
+                if self._are_equal_lists_of_ast(
+                        self, ast_vertex_lists[group[0]], ast_vertex_list):
+                    group.append(idx)
+                    break
+            else:
+                group = [idx]
+                bucket.append(group)
+                groups.append(group)
+
+        return [group for group in groups if len(group) > 1]
+
+    @staticmethod
+    def _flatten_if_chain(self, ast_vertex):
+        """Return "if" vertices of an if-elif chain and its "else" block.
+
+            An "else" block consisting of a single "if" statement is
+            equivalent to "elif", so it continues the chain as well.
+
+            Args:
+                ast_vertex (ast.If): The head of the chain.
+
+            Returns:
+                A tuple of a list of "ast.If" vertices from the head to the
+                last "elif" and a list of statements of the final "else"
+                block, which is empty if there is no "else".
+
+        """
+
+        chain = [ast_vertex]
+        orelse = ast_vertex.orelse
+        while len(orelse) == 1 and isinstance(orelse[0], ast.If):
+            chain.append(orelse[0])
+            orelse = orelse[0].orelse
+        return chain, orelse
+
+    @staticmethod
+    def _describe_positions(self, ast_vertex_list, group):
+        """Return a text description of positions of the grouped vertices.
+
+            Args:
+                ast_vertex_list (list): A list of AST vertices.
+                group (list): Indices of vertices in "ast_vertex_list".
+
+            Returns:
+                Positions as a string, e.g. "#1 at 3:7, #3 at 3:19", where
+                vertices are numbered from 1.
+
+        """
+
+        return ', '.join('#%d at %d:%d' % (idx + 1,
+                                           ast_vertex_list[idx].lineno,
+                                           ast_vertex_list[idx].col_offset)
+                         for idx in group)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""The module represents equal statement blocks checker class.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import ast
+
+import analysis.baseline as baseline
+import checkers.abstract.checker as checker
+import checkers.equal.abstract.equal_checker as equal_checker
+
+DEFAULT_MIN_SIZE = 50
+MAX_LISTED_CLONES = 3
+BLOCK_FIELDS = ('body', 'orelse', 'finalbody')
+
+
+class EqualBlocksChecker(equal_checker.EqualChecker):
+    """The class represents equal statement blocks checker.
+
+    Equal blocks are usually in different files, so the checker does not
+    raise issues itself. It collects fingerprints of function bodies and
+    statement blocks of a file, and a clone index finds equal blocks of the
+    whole project.
+
+    Attributes:
+        ERROR_MSG (str): A message which describes the problem.
+        min_size (int): A minimum number of AST vertices in a block to
+        collect.
+        blocks (list of tuples): Collected blocks of the current file as
+        tuples of a fingerprint, a size, the first line, a column offset and
+        the last line.
+
+    """
+
+    CHECKER_ID = 'equal-blocks'
+    NODE_TYPES = (ast.FunctionDef, ast.If, ast.For, ast.While, ast.With,
+                  ast.TryExcept, ast.TryFinally, ast.ExceptHandler)
+
+    def __init__(self, min_size=DEFAULT_MIN_SIZE):
+        super(EqualBlocksChecker, self).__init__()
+        self.ERROR_MSG = "equal blocks"
+        self.min_size = min_size
+        self.blocks = []
+
+    def prepare(self, file_fingerprinter):
+        super(EqualBlocksChecker, self).prepare(file_fingerprinter)
+        self.blocks = []
+
+    def visit(self, ast_vertex, source_file):
+        fields = ('body',) if isinstance(ast_vertex, ast.FunctionDef) \
+            else BLOCK_FIELDS
+
+        for name in fields:
+            block = getattr(ast_vertex, name, None)
+            if not block:
+                continue
+            size = sum(self.fingerprinter.get_size(statement)
+                       for statement in block)
+            if size < self.min_size:
+                continue
+            self.blocks.append((self.fingerprinter.get_list_hash(block),
+                                size, block[0].lineno, block[0].col_offset,
+                                self.fingerprinter.get_end_line(block[-1])))
+        return False
+
+    def raise_clone_issues(self, clone_group):
+        """Adds an issue to the statistics for every block of a clone group.
+
+        Args:
+            clone_group (list of CloneMembers): Equal blocks found by a clone
+            index.
+
+        Returns:
+            None.
+
+        """
+
+        for member in clone_group:
+            others = ['%s:%d' % (other.path, other.line)
+                      for other in clone_group if other is not member]
+            if len(others) > MAX_LISTED_CLONES:
+                others = others[:MAX_LISTED_CLONES] + \
+                    ['%d more' % (len(others) - MAX_LISTED_CLONES)]
+            err_msg = '%s of %d vertices, also at %s' % \
+                (self.ERROR_MSG, member.size, ', '.join(others))
+            issue_loc = checker.IssueLocation(member.path, member.line,
+                                              member.column, member.end_line)
+            # enclosing functions of blocks are not kept in the index
+            fingerprint = baseline.make_fingerprint(self.CHECKER_ID, '',
+                                                    member.block_hash)
+            self.statistics.add_issue(checker.Issue(issue_loc,
+                                                    self.CHECKER_ID, err_msg,
+                                                    fingerprint=fingerprint))
@@ -33,22 +33,19 @@ class EqualBoolOpChecker(equal_checker.EqualChecker):
 
     """
 
+    CHECKER_ID = 'equal-bool-op'
+    NODE_TYPES = (ast.BoolOp,)
+
     def __init__(self):
         super(EqualBoolOpChecker, self).__init__()
         self.ERROR_MSG = "boolean operation with equal arguments"
 
-    def check(self, ast_vertex, source_file):  # todo: refactor this
-        super(EqualBoolOpChecker, self).check(ast_vertex, source_file)
-
-        if isinstance(ast_vertex, ast.BoolOp):
-            last_idx = len(ast_vertex.values) - 1
-
-            for arg1_idx in range(last_idx):
-                for arg2_idx in range(arg1_idx + 1, last_idx + 1):
-                    arg1 = ast_vertex.values[arg1_idx]
-                    arg2 = ast_vertex.values[arg2_idx]
+    def visit(self, ast_vertex, source_file):
+        groups = self._group_equal_ast_vertices(self, ast_vertex.values)
 
-                    if self._are_equal_ast_vertices(self, arg1, arg2):
-                        self.raise_issue(ast_vertex, source_file, self.ERROR_MSG)
-                        return True
-        return False
+        for group in groups:
+            positions = self._describe_positions(self, ast_vertex.values,
+                                                 group)
+            self.raise_issue(ast_vertex, source_file,
+                             self.ERROR_MSG + ': ' + positions)
+        return len(groups) > 0
@@ -34,18 +34,19 @@ class EqualComparisonChecker(equal_checker.EqualChecker):
 
     """
 
+    CHECKER_ID = 'equal-comparison'
+    NODE_TYPES = (ast.Compare,)
+
     def __init__(self):
         super(EqualComparisonChecker, self).__init__()
         self.ERROR_MSG = "comparison of equal arguments"
 
-    def check(self, ast_vertex, source_file):  # todo: refactor this
-        super(EqualComparisonChecker, self).check(ast_vertex, source_file)
-
-        if isinstance(ast_vertex, ast.Compare):
-            arg1 = ast_vertex.left
-            for arg2 in ast_vertex.comparators:
-                if self._are_equal_ast_vertices(self, arg1, arg2):
-                    self.raise_issue(ast_vertex, source_file, self.ERROR_MSG)
-                    return True
-                arg1 = arg2
-        return False
+    def visit(self, ast_vertex, source_file):
+        args = [ast_vertex.left] + ast_vertex.comparators
+        groups = self._group_equal_ast_vertices(self, args)
+
+        for group in groups:
+            positions = self._describe_positions(self, args, group)
+            self.raise_issue(ast_vertex, source_file,
+                             self.ERROR_MSG + ': ' + positions)
+        return len(groups) > 0
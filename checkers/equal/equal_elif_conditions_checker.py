@@ -27,44 +27,39 @@ from checkers.abstract import checker
 class EqualIfConditionsChecker(equal_checker.EqualChecker):
     """The class represents equal if and elif conditions checker.
 
+    A whole if-elif chain is checked at once from its head, so duplicate
+    conditions are found however far apart they are, and "elif" vertices
+    of an already checked chain are skipped.
+
     Attributes:
         ERROR_MSG (str): A message which describes the problem.
 
     """
 
+    CHECKER_ID = 'equal-if-conditions'
+    NODE_TYPES = (ast.If,)
+
     def __init__(self):
         super(EqualIfConditionsChecker, self).__init__()
         self.ERROR_MSG = "if branches with equal conditions"
-
-    def _get_code_snippet(self, ast_vertex, source_file):
-        super(equal_checker.EqualChecker, self).\
-            _get_code_snippet(ast_vertex, source_file)
-
-        snippet = ''
-        first_line_idx = ast_vertex.lineno - self.SNIPPET_RADIUS - 1
-
-        for else_vertex in ast_vertex.orelse:
-            if isinstance(else_vertex, ast.If):
-                if self._are_equal_ast_vertices(self, ast_vertex.test, else_vertex.test):
-                    last_line_idx = else_vertex.lineno + \
-                                    self.SNIPPET_RADIUS - 1
-
-        source_file.seek(0)
-
-        lines = source_file.readlines()
-
-        for i in range(first_line_idx, last_line_idx):
-            snippet += lines[i]
-        return snippet
-
-    def check(self, ast_vertex, source_file):  # todo: refactor this
-        super(EqualIfConditionsChecker, self).check(ast_vertex, source_file)
-
-        if isinstance(ast_vertex, ast.If):
-            for else_vertex in ast_vertex.orelse:
-                if isinstance(else_vertex, ast.If) and \
-                   self._are_equal_ast_vertices(self, ast_vertex.test, else_vertex.test):
-                    if ast_vertex.col_offset == else_vertex.col_offset - 5:  # todo: it's a magic number!
-                        self.raise_issue(ast_vertex, source_file, self.ERROR_MSG)
-                        return True
-        return False
+        self._chained_ids = set()
+
+    def prepare(self, file_fingerprinter):
+        super(EqualIfConditionsChecker, self).prepare(file_fingerprinter)
+        self._chained_ids = set()
+
+    def visit(self, ast_vertex, source_file):
+        if id(ast_vertex) in self._chained_ids:
+            self._chained_ids.discard(id(ast_vertex))
+            return False
+
+        chain, _ = self._flatten_if_chain(self, ast_vertex)
+        self._chained_ids.update(id(if_vertex) for if_vertex in chain[1:])
+
+        tests = [if_vertex.test for if_vertex in chain]
+        groups = self._group_equal_ast_vertices(self, tests)
+        for group in groups:
+            positions = self._describe_positions(self, tests, group)
+            self.raise_issue(chain[group[0]], source_file,
+                             self.ERROR_MSG + ': ' + positions)
+        return len(groups) > 0
@@ -27,48 +27,42 @@ from checkers.abstract import checker
 class EqualIfBranchesChecker(equal_checker.EqualChecker):
     """The class represents equal if, elif and else branches checker.
 
+    A whole if-elif-else chain is checked at once from its head, so
+    duplicate branches are found however far apart they are, and "elif"
+    vertices of an already checked chain are skipped.
+
     Attributes:
         ERROR_MSG (str): A message which describes the problem.
 
     """
 
+    CHECKER_ID = 'equal-if-branches'
+    NODE_TYPES = (ast.If,)
+
     def __init__(self):
         super(EqualIfBranchesChecker, self).__init__()
         self.ERROR_MSG = "equal if-elif-else branches"
+        self._chained_ids = set()
 
-    def _get_code_snippet(self, ast_vertex, source_file):  # todo: incorrect for elif
-        super(equal_checker.EqualChecker, self).\
-            _get_code_snippet(ast_vertex, source_file)
-
-        snippet = ''
-        first_line_idx = ast_vertex.lineno - self.SNIPPET_RADIUS - 1
-        last_vertex = ast_vertex.orelse[len(ast_vertex.orelse) - 1]
-        last_line_idx = last_vertex.lineno
-
-        source_file.seek(0)
-
-        lines = source_file.readlines()
-
-        for i in range(first_line_idx, last_line_idx):
-            snippet += lines[i]
-        return snippet
-
-    def check(self, ast_vertex, source_file):  # todo: refactor this
-        super(EqualIfBranchesChecker, self).check(ast_vertex, source_file)
-
-        if isinstance(ast_vertex, ast.If):
-            # if else branch the same
-            if self._are_equal_lists_of_ast(self, ast_vertex.body, ast_vertex.orelse):
-                self.raise_issue(ast_vertex, source_file, self.ERROR_MSG)
-                return True
-            else:
-                # if there is the same elif or else after elif branch
-                for else_vertex in ast_vertex.orelse:
-                    if isinstance(else_vertex, ast.If) and \
-                       ast_vertex.col_offset == else_vertex.col_offset - 5:  # todo: it's a magic!
-                        if self._are_equal_lists_of_ast(self, ast_vertex.body, else_vertex.body) or \
-                           self._are_equal_lists_of_ast(self, ast_vertex.body, else_vertex.orelse):
-                            self.raise_issue(ast_vertex, source_file, self.ERROR_MSG)
-                            return True
-        else:
+    def prepare(self, file_fingerprinter):
+        super(EqualIfBranchesChecker, self).prepare(file_fingerprinter)
+        self._chained_ids = set()
+
+    def visit(self, ast_vertex, source_file):
+        if id(ast_vertex) in self._chained_ids:
+            self._chained_ids.discard(id(ast_vertex))
             return False
+
+        chain, orelse = self._flatten_if_chain(self, ast_vertex)
+        self._chained_ids.update(id(if_vertex) for if_vertex in chain[1:])
+
+        branches = [if_vertex.body for if_vertex in chain]
+        if orelse:
+            branches.append(orelse)
+        groups = self._group_equal_lists_of_ast(self, branches)
+        for group in groups:
+            positions = self._describe_positions(
+                self, [branch[0] for branch in branches], group)
+            self.raise_issue(chain[group[0]], source_file,
+                             self.ERROR_MSG + ': ' + positions)
+        return len(groups) > 0
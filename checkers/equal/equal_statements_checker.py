@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""The module represents equal statements checker class.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import ast
+
+import checkers.equal.abstract.equal_checker as equal_checker
+
+BLOCK_FIELDS = ('body', 'orelse', 'finalbody')
+KEY_TYPES = (ast.Num, ast.Str, ast.Name, ast.Attribute)
+
+
+def _get_access_key(ast_vertex):
+    """Returns a hashable key of a name, an attribute or a subscript, which
+    is the same for loads and stores of it, or None for other vertices."""
+    if isinstance(ast_vertex, ast.Name):
+        return ('name', ast_vertex.id)
+    if isinstance(ast_vertex, ast.Attribute):
+        value_key = _get_access_key(ast_vertex.value)
+        if value_key is not None:
+            return ('attr', value_key, ast_vertex.attr)
+    elif isinstance(ast_vertex, ast.Subscript):
+        value_key = _get_access_key(ast_vertex.value)
+        if value_key is not None:
+            return ('sub', value_key, ast.dump(ast_vertex.slice))
+    return None
+
+
+def _get_target_keys(statement):
+    """Returns a set of keys of everything the assignment assigns."""
+    keys = set()
+    for target in statement.targets:
+        elts = target.elts if isinstance(target, (ast.Tuple, ast.List)) \
+            else [target]
+        for elt in elts:
+            key = _get_access_key(elt)
+            if key is not None:
+                keys.add(key)
+    return keys
+
+
+def _uses_any(ast_vertex, keys):
+    """Returns True if the subtree of the vertex loads or stores a name, an
+    attribute or a subscript with one of the keys, False otherwise."""
+    for child in ast.walk(ast_vertex):
+        if isinstance(child, (ast.Name, ast.Attribute, ast.Subscript)) and \
+                _get_access_key(child) in keys:
+            return True
+    return False
+
+
+class EqualStatementsChecker(equal_checker.EqualChecker):
+    """The class represents redundant statements checker.
+
+    It finds equal consecutive assignments in statement blocks, attributes
+    assigned twice in the body of "__init__" and equal keys of dict
+    literals. Every block and dict literal is checked in a single pass with
+    a table of fingerprints or names, so statements are not compared
+    pairwise.
+
+    Equal consecutive assignments are reported with the identifier of the
+    checker, and the other rules with identifiers of their own.
+
+    Attributes:
+        ATTRIBUTE_RULE_ID (str): An identifier of attributes assigned twice.
+        KEY_RULE_ID (str): An identifier of equal keys.
+        ERROR_MSG (str): A message about equal consecutive assignments.
+        ATTRIBUTE_ERROR_MSG (str): A message about attributes assigned twice.
+        KEY_ERROR_MSG (str): A message about equal keys.
+
+    """
+
+    CHECKER_ID = 'equal-statements'
+    ATTRIBUTE_RULE_ID = 'equal-init-attributes'
+    KEY_RULE_ID = 'equal-dict-keys'
+    NODE_TYPES = (ast.Module, ast.FunctionDef, ast.ClassDef, ast.If, ast.For,
+                  ast.While, ast.With, ast.TryExcept, ast.TryFinally,
+                  ast.ExceptHandler, ast.Dict)
+
+    def __init__(self):
+        super(EqualStatementsChecker, self).__init__()
+        self.ERROR_MSG = "equal consecutive assignments"
+        self.ATTRIBUTE_ERROR_MSG = "attribute assigned twice in __init__"
+        self.KEY_ERROR_MSG = "dict literal with equal keys"
+
+    @staticmethod
+    def _check_consecutive_assignments(self, block, source_file):
+        """Raises an issue for every run of equal consecutive assignments
+        and returns indices of statements equal to the previous ones.
+
+        Assignments with calls, e.g. "line = next(lines)", and assignments
+        whose values load what they assign, e.g. "node = node.next", are
+        skipped, as repeating them has an effect. Calls are looked up in
+        the fingerprinter, and the values are walked only for repeated
+        assignments, which are rare.
+
+        """
+        repeated = set()
+        run = []
+        for idx, statement in enumerate(block + [None]):
+            if run and isinstance(statement, ast.Assign) and \
+                    self._are_equal_ast_vertices(self, block[run[0]],
+                                                 statement):
+                first = block[run[0]]
+                if len(run) == 1 and \
+                        _uses_any(first.value, _get_target_keys(first)):
+                    run = []  # equal statements, so this one is skipped too
+                    continue
+                run.append(idx)
+                repeated.add(idx)
+                continue
+            if len(run) > 1:
+                positions = self._describe_positions(self, block, run)
+                self.raise_issue(block[run[0]], source_file,
+                                 self.ERROR_MSG + ': ' + positions)
+            # statements of a run are equal, so the first one is checked
+            run = [idx] if isinstance(statement, ast.Assign) and \
+                not self.fingerprinter.has_effects(statement) else []
+        return repeated
+
+    @staticmethod
+    def _check_init_attributes(self, function_def, repeated, source_file):
+        """Raises an issue for every attribute of "self" assigned more than
+        once in the body of "__init__".
+
+        An assignment is reported only if the value it overwrites is dead:
+        the next assignment of the attribute and the statements in between
+        neither make calls nor use the attribute, e.g. "self.dirs =
+        map(normpath, self.dirs)" or "self.name = None" before
+        "self.name = mkdtemp()", which keeps "self.name" set if the call
+        fails, are not reported.
+
+        """
+        if not function_def.args.args or \
+                not isinstance(function_def.args.args[0], ast.Name):
+            return
+        self_name = function_def.args.args[0].id
+        block = function_def.body
+
+        assignments = {}  # names of attributes to indices of statements
+        names = []
+        for idx, statement in enumerate(block):
+            if idx in repeated or not isinstance(statement, ast.Assign):
+                continue
+            targets = []
+            for target in statement.targets:
+                if isinstance(target, (ast.Tuple, ast.List)):
+                    targets.extend(target.elts)
+                else:
+                    targets.append(target)
+            for target in targets:
+                if isinstance(target, ast.Attribute) and \
+                        isinstance(target.value, ast.Name) and \
+                        target.value.id == self_name:
+                    if target.attr not in assignments:
+                        assignments[target.attr] = []
+                        names.append(target.attr)
+                    if idx not in assignments[target.attr]:
+                        assignments[target.attr].append(idx)
+
+        for name in names:
+            keys = {('attr', ('name', self_name), name)}
+            group = [assignments[name][0]]
+            for idx in assignments[name][1:] + [None]:
+                if idx is not None and self._overwrites_dead_value(
+                        self, block, group[-1], idx, keys):
+                    group.append(idx)
+                    continue
+                if len(group) > 1:
+                    positions = self._describe_positions(self, block, group)
+                    self.raise_issue(block[group[0]], source_file,
+                                     self.ATTRIBUTE_ERROR_MSG + ': ' +
+                                     self_name + '.' + name + ' (' +
+                                     positions + ')', self.ATTRIBUTE_RULE_ID)
+                group = [idx]
+
+    @staticmethod
+    def _overwrites_dead_value(self, block, first_idx, second_idx, keys):
+        """Returns True if the assignment at "second_idx" overwrites the value
+        assigned at "first_idx" which is not used, False otherwise."""
+        second = block[second_idx]
+        if self.fingerprinter.has_effects(second) or \
+                _uses_any(second.value, keys):
+            return False
+        for statement in block[first_idx + 1:second_idx]:
+            if self.fingerprinter.has_effects(statement) or \
+                    _uses_any(statement, keys):
+                return False
+        return True
+
+    def visit(self, ast_vertex, source_file):
+        issues_count = len(self.statistics.raised_issues)
+
+        if isinstance(ast_vertex, ast.Dict):
+            keys = [key for key in ast_vertex.keys
+                    if isinstance(key, KEY_TYPES)]
+            for group in self._group_equal_ast_vertices(self, keys):
+                positions = self._describe_positions(self, keys, group)
+                self.raise_issue(ast_vertex, source_file,
+                                 self.KEY_ERROR_MSG + ': ' + positions,
+                                 self.KEY_RULE_ID)
+            return len(self.statistics.raised_issues) > issues_count
+
+        for name in BLOCK_FIELDS:
+            block = getattr(ast_vertex, name, None)
+            if not block:
+                continue
+            repeated = self._check_consecutive_assignments(self, block,
+                                                           source_file)
+            if name == 'body' and isinstance(ast_vertex, ast.FunctionDef) \
+                    and ast_vertex.name == '__init__':
+                self._check_init_attributes(self, ast_vertex, repeated,
+                                            source_file)
+        return len(self.statistics.raised_issues) > issues_count
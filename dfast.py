@@ -3,6 +3,22 @@
 
 Examples:
         $ python path2ProjectRoot/dfast.py path2ProjectToAnalyse > output.txt
+        $ python path2ProjectRoot/dfast.py --jobs 8 path2ProjectToAnalyse
+        $ python path2ProjectRoot/dfast.py --no-cache path2ProjectToAnalyse
+        $ python path2ProjectRoot/dfast.py --format sarif -o out.sarif path
+        $ python path2ProjectRoot/dfast.py --profile path2ProjectToAnalyse
+        $ python path2ProjectRoot/dfast.py --diff-base origin/master path
+        $ python path2ProjectRoot/dfast.py --clones path2ProjectToAnalyse
+        $ python path2ProjectRoot/dfast.py --normalize path2ProjectToAnalyse
+        $ find . -name '*.py' -print0 | python path2ProjectRoot/dfast.py \
+                --files-from -
+        $ python path2ProjectRoot/dfast.py --shard 1/4 -f jsonl -o 1.jsonl path
+        $ python path2ProjectRoot/dfast.py merge 1.jsonl 2.jsonl 3.jsonl 4.jsonl
+        $ python path2ProjectRoot/dfast.py --archives path2ArtifactCache
+        $ python path2ProjectRoot/dfast.py path2Package.tar.gz
+        $ python path2ProjectRoot/dfast.py history --last 20 v1.0 v2.0
+        $ python path2ProjectRoot/dfast.py daemon path2ProjectToAnalyse &
+        $ python path2ProjectRoot/dfast.py client analyze path2File.py
 
 Copyright (C) 2016-2017 Arthur Vaschenkov
 
@@ -27,50 +43,1106 @@ Todo:
 import sys
 import os
 import ast
+import json
+import time
+import argparse
+import socket
+import multiprocessing
 
+import checkers.equal.equal_blocks_checker as equal_blocks_checker
 import checkers.equal.equal_bool_op_checker as equal_bool_op_checker
 import checkers.equal.equal_comp_checker as equal_comp_checker
 import checkers.equal.equal_elif_conditions_checker as equal_elif_conditions_checker
 import checkers.equal.equal_if_branches_checker as equal_if_branches_checker
+import checkers.equal.equal_statements_checker as equal_statements_checker
+import analysis.archives as archives
+import analysis.baseline as baseline
+import analysis.budget as budget
+import analysis.clone_index as clone_index
+import analysis.daemon as daemon
+import analysis.discovery as discovery
+import analysis.dispatch_table as dispatch_table
+import analysis.file_report as file_report
+import analysis.fingerprinter as fingerprinter
+import analysis.git as git
+import analysis.git_diff as git_diff
+import analysis.git_history as git_history
+import analysis.prioritization as prioritization
+import analysis.profiler as profiler
+import analysis.result_cache as result_cache
+import analysis.result_merge as result_merge
+import analysis.sharding as sharding
+import analysis.source_text as source_text
+import reporters.text_reporter as text_reporter
+import reporters.json_lines_reporter as json_lines_reporter
+import reporters.sarif_reporter as sarif_reporter
 
+PARSING_FAILED_MSG = 'Parsing failed!'
+READING_BLOB_FAILED_MSG = 'Reading the git blob failed!'
+POOL_CHUNK_SIZE = 16
+EXIT_ISSUES = 1  # an exit code if issues are reported and must fail a run
+EXIT_FATAL = 2  # an exit code of fatal errors, the same as of usage errors
+DEFAULT_CACHE_DIR = '.dfast_cache'
+REPORTERS = {
+    'text': text_reporter.TextReporter,
+    'jsonl': json_lines_reporter.JsonLinesReporter,
+    'sarif': sarif_reporter.SarifReporter
+}
 
-def walk(checker_list, source_file):
-    ast_root = ast.parse(source_file.read())
-    for ast_vertex in ast.walk(ast_root):
-        for checker in checker_list:
-            checker.check(ast_vertex, source_file)
+_result_cache = None  # a cache used by check_file in the current process
 
 
-def show_issues(checkers):
+_render_snippets = True  # whether check_file builds code snippets
+_profile = False  # whether check_file profiles the analysis
+_clone_min_size = None  # a minimum size of blocks for the clone index
+_file_budget = None  # limits of the analysis of a file
+_normalize = False  # whether the order of commutative operands is ignored
+
+
+def fail(message):
+    """Writes the message of a fatal error to standard error and exits with
+    EXIT_FATAL, so a fatal error is not taken for reported issues."""
+    sys.stderr.write(message + '\n')
+    sys.exit(EXIT_FATAL)
+
+
+def create_checkers(render_snippets=True, clone_min_size=None):
+    checkers = [
+        equal_bool_op_checker.EqualBoolOpChecker(),
+        equal_comp_checker.EqualComparisonChecker(),
+        equal_elif_conditions_checker.EqualIfConditionsChecker(),
+        equal_if_branches_checker.EqualIfBranchesChecker(),
+        equal_statements_checker.EqualStatementsChecker()
+    ]
+    if clone_min_size is not None:
+        checkers.append(equal_blocks_checker.EqualBlocksChecker(clone_min_size))
     for checker in checkers:
-        for issue in checker.statistics.raised_issues:
-            description = issue.description
+        checker.render_snippets = render_snippets
+    return checkers
+
+
+def walk(checker_list, source_file, file_profiler=None, file_budget=None,
+         ast_root=None, table=None, normalize=False):
+    if ast_root is None and file_profiler is None:
+        ast_root = ast.parse(source_file.text)
+    elif ast_root is None:
+        ast_root = file_profiler.wrap('parse', ast.parse)(source_file.text)
+    max_vertices = file_budget.max_vertices if file_budget is not None \
+        else None
+    file_fingerprinter = fingerprinter.Fingerprinter(normalize, max_vertices)
+    file_fingerprinter.index(ast_root)
+    for checker in checker_list:
+        checker.prepare(file_fingerprinter)
+
+    if table is None:
+        table = dispatch_table.DispatchTable(checker_list)
+    if file_profiler is None:
+        table.walk(ast_root, source_file)
+    else:
+        file_profiler.wrap('walk', table.walk)(ast_root, source_file)
+        file_profiler.count('vertices', file_fingerprinter.vertex_count)
+
+
+def analyse_file(source_file, render_snippets=True, file_profiler=None,
+                 clone_min_size=None, file_budget=None, normalize=False):
+    """Analyses a source file.
+
+    Args:
+        source_file (SourceText): The file to analyse.
+        render_snippets (bool): Whether code snippets of issues are built.
+        file_profiler (Profiler): A profiler of the analysis or None.
+        clone_min_size (int): A minimum size of blocks collected for the
+        clone index or None not to collect them.
+        file_budget (FileBudget): Limits of the analysis or None. The time
+        limit is enforced by the caller.
+        normalize (bool): Whether the order of commutative operands is
+        ignored when vertices are compared.
+
+    Returns:
+        A tuple of a list of raised issues, an error message, which is None
+        if the file was parsed, and a list of collected blocks, which is
+        None if blocks are not collected.
+
+    Raises:
+        BudgetExceeded: If the AST of the file is over the limit.
+
+    """
+
+    checkers = create_checkers(render_snippets, clone_min_size)
+    if file_profiler is not None:
+        for checker in checkers:
+            file_profiler.instrument(checker)
+    try:
+        walk(checkers, source_file, file_profiler, file_budget,
+             normalize=normalize)
+    except (SyntaxError, TypeError, ValueError, MemoryError):
+        return [], PARSING_FAILED_MSG, None
+
+    issues = []
+    blocks = None
+    for checker in checkers:
+        issues.extend(checker.statistics.raised_issues)
+        if isinstance(checker, equal_blocks_checker.EqualBlocksChecker):
+            blocks = checker.blocks
+    return issues, None, blocks
+
+
+def analyse_sources(sources, render_snippets=True, normalize=False):
+    """Analyses source texts in the current process.
+
+    Nothing is read from or written to disk, and a single set of checkers is
+    reused for all sources. Sources are analysed one by one as reports are
+    taken, so the iterable may be a generator of any length.
+
+    Examples:
+        >>> for report in analyse_sources([('gen.py', 'x = a == a\\n')]):
+        ...     for issue in report.issues:
+        ...         print issue.description
+
+    Args:
+        sources (iterable of tuples): Tuples of a name and a text of a
+        source, optionally followed by its AST if the caller has parsed it.
+        render_snippets (bool): Whether code snippets of issues are built.
+        normalize (bool): Whether the order of commutative operands is
+        ignored when vertices are compared.
+
+    Returns:
+        A generator of FileReports, one per source in the order of sources.
+
+    """
+
+    checkers = create_checkers(render_snippets)
+    table = dispatch_table.DispatchTable(checkers)
+    for source in sources:
+        ast_root = source[2] if len(source) > 2 else None
+        source_file = source_text.SourceText(source[0], source[1])
+        error = None
+        try:
+            walk(checkers, source_file, ast_root=ast_root, table=table,
+                 normalize=normalize)
+        except (SyntaxError, TypeError, ValueError, MemoryError):
+            error = PARSING_FAILED_MSG
+
+        issues = []
+        for checker in checkers:
+            issues.extend(checker.statistics.pop_issues())
+        if error is not None:
+            issues = []  # the walk might have been interrupted halfway
+        yield file_report.FileReport(source_file.name, issues, error)
+
+
+def init_worker(cache, render_snippets=True, profile=False,
+                clone_min_size=None, file_budget=None, normalize=False):
+    """Initialises the current process to run check_file.
+
+    Args:
+        cache (ResultCache): A cache of results or None.
+        render_snippets (bool): Whether code snippets of issues are built.
+        profile (bool): Whether reports contain profiles of the analysis.
+        clone_min_size (int): A minimum size of blocks collected for the
+        clone index or None not to collect them.
+        file_budget (FileBudget): Limits of the analysis of a file or None.
+        normalize (bool): Whether the order of commutative operands is
+        ignored when vertices are compared.
+
+    """
+
+    global _result_cache, _render_snippets, _profile, _clone_min_size, \
+        _file_budget, _normalize
+    _result_cache = cache
+    _render_snippets = render_snippets
+    _profile = profile
+    _clone_min_size = clone_min_size
+    _file_budget = file_budget
+    _normalize = normalize
+
+
+def check_file(file_path):
+    """Analyses a single file and returns a picklable report.
+
+    Results of unchanged files are taken from the cache without parsing.
+    If profiling is on, the report contains a profile of the file.
+    A file which goes over a limit of the budget is reported as skipped and
+    is not cached.
+    The function is used by worker processes, so it never raises: any
+    failure is recorded in the report.
+
+    Args:
+        file_path (str): A path to the file to analyse.
+
+    Returns:
+        FileReport with the raised issues.
+
+    """
+
+    try:
+        with open(file_path, 'r') as source_file:
+            if _file_budget is not None:
+                _file_budget.check_size(os.fstat(source_file.fileno()).st_size)
+            source = source_file.read()
+    except budget.BudgetExceeded as e:
+        file_profiler = None
+        if _profile:
+            file_profiler = profiler.Profiler()
+            file_profiler.count('skipped files')
+            file_profiler = file_profiler.to_dict()
+        return file_report.FileReport(file_path, profile=file_profiler,
+                                      skipped=str(e))
+    except Exception as e:
+        return file_report.FileReport(file_path, error=str(e))
+    return check_source(file_path, source)
+
+
+def check_named_source(named_source):
+    """Calls "check_source" for a tuple of a name and a content of a git
+    blob or an archive member, checking its size first."""
+    file_path, source = named_source
+    if source is None:
+        return file_report.FileReport(file_path,
+                                      error=READING_BLOB_FAILED_MSG)
+    if _file_budget is not None:
+        try:
+            _file_budget.check_size(len(source))
+        except budget.BudgetExceeded as e:
+            return file_report.FileReport(file_path, skipped=str(e))
+    return check_source(file_path, source)
+
+
+def check_source(file_path, source):
+    """Analyses the content of a file and returns a picklable report.
+
+    It is "check_file" for a content which is already read.
+
+    Args:
+        file_path (str): A name of the file in the report.
+        source (str): The content of the file.
+
+    Returns:
+        FileReport with the raised issues.
+
+    Raises:
+        DeadlineExceeded: If the deadline of the run passes during the
+        analysis, so the file is left for a later run.
+
+    """
+
+    file_profiler = profiler.Profiler() if _profile else None
+    start = time.time()
+
+    try:
+        if _result_cache is not None:
+            cached = _result_cache.get(source)
+            if cached is not None:
+                issues, error, blocks = cached
+                # the same content may have been cached under another path
+                issues = [issue if issue.issue_loc.path == file_path
+                          else issue.relocated(file_path) for issue in issues]
+                if file_profiler is not None:
+                    file_profiler.count('cache hits')
+                    file_profiler = file_profiler.to_dict()
+                return file_report.FileReport(file_path, issues, error,
+                                              file_profiler, blocks)
+        analyse_args = (source_text.SourceText(file_path, source),
+                        _render_snippets, file_profiler, _clone_min_size,
+                        _file_budget, _normalize)
+        if _file_budget is None:
+            issues, error, blocks = analyse_file(*analyse_args)
+        else:
+            issues, error, blocks = _file_budget.call(analyse_file,
+                                                      *analyse_args)
+    except budget.DeadlineExceeded:
+        raise
+    except budget.BudgetExceeded as e:
+        if file_profiler is not None:
+            file_profiler.count('skipped files')
+            file_profiler = file_profiler.to_dict()
+        return file_report.FileReport(file_path, profile=file_profiler,
+                                      skipped=str(e))
+    except Exception as e:
+        return file_report.FileReport(file_path, error=str(e))
+
+    if _result_cache is not None:
+        _result_cache.put(source, issues, error, blocks)
+    if file_profiler is not None:
+        file_profiler.add_file(file_path, time.time() - start,
+                               file_profiler.counters.get('vertices', 0))
+        file_profiler = file_profiler.to_dict()
+    return file_report.FileReport(file_path, issues, error, file_profiler,
+                                  blocks)
+
+
+def check_archive(archive_path):
+    """Analyses .py files of an archive without extracting them.
+
+    Args:
+        archive_path (str): A path to the archive.
+
+    Returns:
+        A list of FileReports of the members named as "archive!member".
+        Members over the size limit are skipped without being decompressed.
+        If the archive can not be read, the last report has the error.
+
+    """
+
+    check_size = _file_budget.check_size if _file_budget is not None \
+        else None
+    reports = []
+    try:
+        for name, source, error in archives.iter_archive_sources(
+                archive_path, check_size):
+            if isinstance(error, budget.BudgetExceeded):
+                reports.append(file_report.FileReport(name, skipped=str(error)))
+            elif error is not None:
+                reports.append(file_report.FileReport(name, error=str(error)))
+            else:
+                reports.append(check_source(name, source))
+    except archives.ArchiveError as e:
+        reports.append(file_report.FileReport(archive_path, error=str(e)))
+    return reports
+
+
+def check_input(path):
+    """Analyses a source file or all source files of an archive.
+
+    Args:
+        path (str): A path to a .py file or to an archive.
+
+    Returns:
+        A list of FileReports.
+
+    """
+
+    if archives.is_archive(path):
+        return check_archive(path)
+    return [check_file(path)]
+
+
+def check_input_in_time(path):
+    """Calls "check_input" and returns a tuple of the path and the reports,
+    or of the path and None if the deadline of the run passed during the
+    analysis."""
+    try:
+        return path, check_input(path)
+    except budget.DeadlineExceeded:
+        return path, None
+
+
+def collect_paths(source_path_p):
+    """Returns a sorted list of paths to the .py files in the directory."""
+    return list(discovery.FileDiscovery().iter_paths(source_path_p))
+
 
-            print description
+def _time_paths(paths, run_profiler):
+    """Yields the paths and adds the time spent to get them to the profile.
 
+    Paths are found while files are analysed, so the time of discovery is
+    the time spent waiting for the next path.
 
-def check_path(source_path_p):
-    for file_name in os.listdir(source_path_p):
-        if os.path.isfile(source_path_p + '/' + file_name) and \
-                file_name.lower().endswith('.py'):
-            source_file = open(source_path_p + '/' + file_name, 'r')
+    """
 
-            checkers = [
-                equal_bool_op_checker.EqualBoolOpChecker(),
-                equal_comp_checker.EqualComparisonChecker(),
-                equal_elif_conditions_checker.EqualIfConditionsChecker(),
-                equal_if_branches_checker.EqualIfBranchesChecker()
-            ]
+    elapsed = 0.0
+    iterator = iter(paths)
+    while True:
+        start = time.time()
+        path = next(iterator, None)
+        elapsed += time.time() - start
+        if path is None:
+            break
+        yield path
+    run_profiler.add_time('discovery', elapsed)
 
+
+def _iter_until(results, deadline):
+    """Yields results of a pool until the deadline.
+
+    The next result is awaited no longer than the time left, so a run stops
+    on time even if a worker is busy with a large file.
+
+    """
+
+    if deadline is None:
+        for result in results:
+            yield result
+        return
+    while True:
+        timeout = deadline - time.time()
+        if timeout <= 0:
+            return
+        try:
+            result = results.next(timeout)
+        except (StopIteration, multiprocessing.TimeoutError):
+            return
+        yield result
+
+
+def report_clones(index, reporter, known_issues=None):
+    """Reports equal blocks found in different files.
+
+    Args:
+        index (CloneIndex): An index of blocks of all analysed files.
+        reporter (Reporter): A reporter to write the issues.
+        known_issues (Baseline): A baseline of issues not to report or None.
+
+    """
+
+    blocks_checker = equal_blocks_checker.EqualBlocksChecker()
+    for group in index.find_clone_groups():
+        blocks_checker.raise_clone_issues(group)
+
+    reports = {}
+    for issue in blocks_checker.statistics.raised_issues:
+        path = issue.issue_loc.path
+        reports.setdefault(path, file_report.FileReport(path))
+        reports[path].issues.append(issue)
+    for path in sorted(reports):
+        reports[path].issues.sort(key=lambda issue: issue.issue_loc.line)
+        if known_issues is not None:
+            reports[path].issues = known_issues.filter(reports[path].issues)
+        reporter.report_file(reports[path])
+
+
+def check_path(source_path_p, reporter, jobs=1, cache=None,
+               render_snippets=True, run_profiler=None, changed_lines=None,
+               clone_min_size=None, paths=None, file_budget=None,
+               max_files_per_worker=None, normalize=False, deadline=None,
+               known_issues=None):
+    """Analyses all .py files in the directory and reports found issues.
+
+    Issues of a file are passed to the reporter as soon as the file is
+    analysed, in the order of the paths regardless of the number of jobs,
+    so the output is deterministic. If a deadline is given, files are
+    reported in the order they are finished instead, so a large file does
+    not hold back the files after it.
+
+    Args:
+        source_path_p (str): A path to the directory to analyse.
+        reporter (Reporter): A reporter to write the issues.
+        jobs (int): A number of worker processes. If it is 1, files are
+        analysed in the current process.
+        cache (ResultCache): A cache of results or None.
+        render_snippets (bool): Whether code snippets of issues are built.
+        run_profiler (Profiler): A profiler to merge profiles of files into
+        or None.
+        changed_lines (dict): Paths of changed files mapped to their changed
+        line ranges, as returned by "git_diff.get_changed_lines". If it is
+        given, only the paths of changed files are analysed, so the filters
+        which produced the paths still apply, and only issues which overlap
+        changed lines are reported.
+        clone_min_size (int): A minimum size of blocks to search for equal
+        ones in different files or None not to search them. Clones are
+        reported after all files.
+        paths (iterable of str): Paths of files to analyse instead of the
+        .py files of the directory, e.g. found by a FileDiscovery or read
+        from a file list. Files are analysed while paths are produced.
+        Archives among them are analysed in place, one per worker task.
+        file_budget (FileBudget): Limits of the analysis of a file or None.
+        max_files_per_worker (int): A number of files after which a worker
+        process is replaced by a new one to release its memory, or None to
+        keep workers until the end.
+        normalize (bool): Whether the order of commutative operands is
+        ignored when vertices are compared.
+        deadline (float): A time in seconds since the epoch after which no
+        more files are analysed, or None. If it is given, all paths are
+        collected first and analysed in the order of
+        "prioritization.prioritize", and the analysis of a file still in
+        progress at the deadline is interrupted.
+        known_issues (Baseline): A baseline of issues not to report or None.
+        It also collects fingerprints of all found issues.
+
+    Returns:
+        A tuple of the number of analysed paths and a list of paths not
+        analysed or interrupted when the deadline passed.
+
+    """
+
+    if paths is None:
+        paths = discovery.FileDiscovery().iter_paths(source_path_p)
+    if changed_lines is not None:
+        # paths are matched to the keys of the changed lines, which are
+        # looked up by the paths of reports
+        changed_paths = dict((os.path.normpath(path), path)
+                             for path in changed_lines)
+        paths = sorted(changed_paths[os.path.normpath(path)] for path in paths
+                       if os.path.normpath(path) in changed_paths)
+    prioritized_paths = None  # a list to find the paths left
+    if deadline is not None:
+        paths = prioritized_paths = prioritization.prioritize(
+            paths, source_path_p or os.curdir)
+        if file_budget is None:
+            file_budget = budget.FileBudget(None, None, None)
+        file_budget = file_budget.with_deadline(deadline)
+    if run_profiler is not None:
+        paths = _time_paths(paths, run_profiler)
+
+    index = clone_index.CloneIndex() if clone_min_size is not None else None
+
+    def report_file(report):
+        if report.profile is not None:
+            run_profiler.merge(report.profile)
+        if index is not None:
+            index.update(report.path, report.blocks)
+        if changed_lines is not None:
+            hunks = changed_lines[report.path]
+            report.issues = [issue for issue in report.issues
+                             if git_diff.is_changed(hunks,
+                                                    issue.issue_loc.line,
+                                                    issue.issue_loc.end_line)]
+        if known_issues is not None:
+            report.issues = known_issues.filter(report.issues)
+        reporter.report_file(report)
+
+    init_args = (cache, render_snippets, run_profiler is not None,
+                 clone_min_size, file_budget, normalize)
+
+    analysed_count = 0
+    analysed_paths = set()  # to find the paths left after the deadline
+    if jobs == 1:
+        init_worker(*init_args)
+        for path in paths:
+            if deadline is not None and time.time() >= deadline:
+                break
+            path, reports = check_input_in_time(path)
+            if reports is None:
+                break
+            for report in reports:
+                report_file(report)
+            analysed_count += 1
+            analysed_paths.add(path)
+    else:
+        # only the iterator of an unchunked imap waits with a timeout
+        chunk_size = POOL_CHUNK_SIZE if deadline is None else 1
+        max_tasks = None
+        if max_files_per_worker:  # a task of a worker is a chunk of files
+            max_tasks = max(1, max_files_per_worker // chunk_size)
+        pool = multiprocessing.Pool(jobs, init_worker, init_args, max_tasks)
+        try:
+            if deadline is None:
+                results = pool.imap(check_input_in_time, paths, chunk_size)
+            else:
+                results = pool.imap_unordered(check_input_in_time, paths,
+                                              chunk_size)
+            for path, reports in _iter_until(results, deadline):
+                if reports is None:
+                    continue
+                for report in reports:
+                    report_file(report)
+                analysed_count += 1
+                analysed_paths.add(path)
+            if deadline is not None and \
+                    analysed_count < len(prioritized_paths):
+                pool.terminate()  # files in progress are not waited for
+            else:
+                pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+    if index is not None:
+        start = time.time()
+        report_clones(index, reporter, known_issues)
+        if run_profiler is not None:
+            run_profiler.add_time('clones', time.time() - start)
+
+    remaining_paths = []
+    if prioritized_paths is not None:
+        remaining_paths = [path for path in prioritized_paths
+                           if path not in analysed_paths]
+    return analysed_count, remaining_paths
+
+
+def report_time_budget(args, analysed_count, remaining_paths):
+    """Writes a summary of a time-budgeted run to standard error and the
+    list of files left to the file of --remaining-output."""
+    total_count = analysed_count + len(remaining_paths)
+    if remaining_paths:
+        sys.stderr.write('Time budget of %gs is exhausted: %d of %d files '
+                         'analysed, %d left.\n' %
+                         (args.time_budget, analysed_count, total_count,
+                          len(remaining_paths)))
+    else:
+        sys.stderr.write('Time budget of %gs: all %d files analysed.\n' %
+                         (args.time_budget, total_count))
+    if args.remaining_output is not None:
+        with open(args.remaining_output, 'wb') as remaining_output:
+            for path in remaining_paths:
+                remaining_output.write(path + '\0')
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description='Finds equal operands, conditions and branches in '
+                    'Python code.',
+        epilog='Run "dfast.py daemon -h" and "dfast.py client -h" for the '
+               'daemon mode, "dfast.py merge -h" to merge reports of '
+               'shards and "dfast.py history -h" to analyse git revisions.')
+    parser.add_argument('source_path', nargs='?',
+                        help='a directory, a file or an archive to analyse')
+    parser.add_argument('--files-from', metavar='FILE',
+                        help='analyse files of a NUL-separated list instead '
+                             'of a directory, "-" means standard input')
+    parser.add_argument('--include', metavar='GLOB', action='append',
+                        help='analyse only files with matching names, may be '
+                             'repeated (default: *.py)')
+    parser.add_argument('--exclude', metavar='GLOB', action='append',
+                        default=[],
+                        help='skip files and directories with matching names '
+                             'or relative paths, may be repeated')
+    parser.add_argument('--no-default-excludes', action='store_true',
+                        help='do not skip directories like .git, .venv, '
+                             'node_modules and build')
+    parser.add_argument('--no-gitignore', action='store_true',
+                        help='do not skip files ignored by .gitignore files')
+    parser.add_argument('--archives', action='store_true',
+                        help='analyse also .py files inside zip, wheel, egg '
+                             'and tar archives in the directory')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='a number of worker processes, 0 means one '
+                             'per CPU (default: 1)')
+    parser.add_argument('--max-file-size', metavar='BYTES', type=int,
+                        default=budget.DEFAULT_MAX_FILE_SIZE,
+                        help='skip files larger than the size, 0 means no '
+                             'limit (default: %(default)s)')
+    parser.add_argument('--max-vertices', metavar='N', type=int,
+                        default=budget.DEFAULT_MAX_VERTICES,
+                        help='skip files with more AST vertices, 0 means no '
+                             'limit (default: %(default)s)')
+    parser.add_argument('--file-time-limit', metavar='SECONDS', type=float,
+                        default=budget.DEFAULT_TIME_LIMIT,
+                        help='skip files analysed longer, 0 means no limit '
+                             '(default: %(default)s)')
+    parser.add_argument('--max-files-per-worker', metavar='N', type=int,
+                        default=0,
+                        help='replace a worker process after it analyses '
+                             'about N files, 0 means never (default: '
+                             '%(default)s)')
+    parser.add_argument('--time-budget', metavar='SECONDS', type=float,
+                        help='stop analysing after the time, starting with '
+                             'files changed in git, then the most recently '
+                             'modified and the smallest ones')
+    parser.add_argument('--remaining-output', metavar='FILE',
+                        help='write a NUL-separated list of files left by '
+                             '--time-budget to the file, to continue with '
+                             '--files-from')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='a directory for the cache of results '
+                             '(default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='analyse all files without the cache')
+    parser.add_argument('--no-snippets', action='store_true',
+                        help='do not print code snippets of issues')
+    parser.add_argument('-f', '--format', choices=sorted(REPORTERS),
+                        default='text',
+                        help='an output format (default: %(default)s)')
+    parser.add_argument('-o', '--output',
+                        help='a file to write the report to (default: '
+                             'standard output)')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='do not report issues listed in the baseline '
+                             'file')
+    parser.add_argument('--write-baseline', metavar='FILE',
+                        help='write fingerprints of all found issues to the '
+                             'file, to suppress them with --baseline')
+    parser.add_argument('--fail-on-issues', action='store_true',
+                        help='exit with %d if any issue is reported'
+                             % EXIT_ISSUES)
+    parser.add_argument('--diff-base', metavar='REF',
+                        help='analyse only lines changed since the git '
+                             'revision')
+    parser.add_argument('--shard', metavar='I/N',
+                        help='analyse only the I-th of N parts of the files, '
+                             'assigned by a hash of their relative paths')
+    parser.add_argument('--normalize', action='store_true',
+                        help='ignore the order of commutative operands, e.g. '
+                             'report "a == b or b == a"')
+    parser.add_argument('--clones', action='store_true',
+                        help='find equal statement blocks in different files')
+    parser.add_argument('--clone-min-size', metavar='N', type=int,
+                        default=equal_blocks_checker.DEFAULT_MIN_SIZE,
+                        help='a minimum number of AST vertices in a block '
+                             'for --clones (default: %(default)s)')
+    parser.add_argument('--profile', action='store_true',
+                        help='print a profile of the analysis to standard '
+                             'error')
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help='write the profile as JSON to the file')
+    parser.add_argument('--profile-slowest', metavar='N', type=int,
+                        default=profiler.DEFAULT_SLOWEST_COUNT,
+                        help='a number of the slowest files in the profile '
+                             '(default: %(default)s)')
+    args = parser.parse_args(argv)
+    if args.source_path is None and args.files_from is None:
+        parser.error('either source_path or --files-from is required')
+    if args.diff_base is not None and args.source_path is None:
+        parser.error('argument --diff-base: source_path is required')
+    if args.jobs < 0:
+        parser.error('argument -j/--jobs: must not be negative')
+    if args.jobs == 0:
+        args.jobs = multiprocessing.cpu_count()
+    for name in ('max_file_size', 'max_vertices', 'file_time_limit',
+                 'max_files_per_worker'):
+        if getattr(args, name) < 0:
+            parser.error('argument --' + name.replace('_', '-') +
+                         ': must not be negative')
+    if args.clone_min_size < 1:
+        parser.error('argument --clone-min-size: must be positive')
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error('argument --time-budget: must be positive')
+    if args.remaining_output is not None and args.time_budget is None:
+        parser.error('argument --remaining-output: --time-budget is required')
+    if args.shard is not None:
+        try:
+            args.shard = sharding.Shard.parse(args.shard)
+        except ValueError as e:
+            parser.error('argument --shard: ' + str(e))
+    return args
+
+
+def open_cache(args):
+    """Returns the cache of results for the options or None."""
+    if args.no_cache:
+        return None
+    version = result_cache.get_checker_set_version(
+        ['analysis.fingerprinter', 'analysis.dispatch_table',
+         'analysis.source_text'])
+    if args.no_snippets:  # cached issues have no snippets
+        version += '-no-snippets'
+    if getattr(args, 'clones', False):  # cached results have blocks
+        version += '-clones' + str(args.clone_min_size)
+    if args.normalize:
+        version += '-normalize'
+    return result_cache.ResultCache(args.cache_dir, version)
+
+
+def run_history(argv):
+    """Analyses git revisions and returns the exit code of "main"."""
+    parser = argparse.ArgumentParser(
+        prog='dfast.py history',
+        description='Analyses .py files of git revisions without a '
+                    'checkout. Every distinct file content is analysed '
+                    'once, and its issues are reported for every revision '
+                    'and path containing it as "revision:path".')
+    parser.add_argument('revisions', nargs='*', metavar='REVISION',
+                        help='a git revision to analyse, e.g. a release tag '
+                             '(default: HEAD unless --last is given)')
+    parser.add_argument('--last', metavar='N', type=int, default=0,
+                        help='analyse also the last N commits of HEAD')
+    parser.add_argument('--repo', default='.',
+                        help='a directory inside the git repository '
+                             '(default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='a number of worker processes, 0 means one '
+                             'per CPU (default: 1)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='a directory for the cache of results '
+                             '(default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='analyse all files without the cache')
+    parser.add_argument('--no-snippets', action='store_true',
+                        help='do not print code snippets of issues')
+    parser.add_argument('--normalize', action='store_true',
+                        help='ignore the order of commutative operands')
+    parser.add_argument('-f', '--format', choices=sorted(REPORTERS),
+                        default='text',
+                        help='an output format (default: %(default)s)')
+    parser.add_argument('-o', '--output',
+                        help='a file to write the report to (default: '
+                             'standard output)')
+    parser.add_argument('--fail-on-issues', action='store_true',
+                        help='exit with %d if any issue is reported'
+                             % EXIT_ISSUES)
+    args = parser.parse_args(argv)
+    if args.jobs < 0 or args.last < 0:
+        parser.error('arguments -j/--jobs and --last must not be negative')
+    if args.jobs == 0:
+        args.jobs = multiprocessing.cpu_count()
+
+    revisions = list(args.revisions)
+    try:
+        if args.last:
+            revisions.extend(git_history.get_last_commits(args.last,
+                                                          args.repo))
+        if not revisions:
+            revisions = ['HEAD']
+        occurrences = []
+        for revision in revisions:
+            occurrences.extend(git_history.list_source_blobs(revision,
+                                                             args.repo))
+        reader = git_history.BlobReader(args.repo)
+    except git.GitError as e:
+        fail(str(e))
+
+    cache = open_cache(args)
+    init_args = (cache, not args.no_snippets, False, None,
+                 budget.FileBudget(), args.normalize)
+    blobs = git_history.iter_unique_blobs(occurrences, reader)
+    shas = dict((occurrence.name, occurrence.sha)
+                for occurrence in reversed(occurrences))
+    reports = {}  # reports of blobs by their hashes
+    try:
+        if args.jobs == 1:
+            init_worker(*init_args)
+            for named_source in blobs:
+                report = check_named_source(named_source)
+                reports[shas[report.path]] = report
+        else:
+            pool = multiprocessing.Pool(args.jobs, init_worker, init_args)
             try:
-                walk(checkers, source_file)
-            except SyntaxError:
-                print 'Parsing failed!'
-            source_file.close()
-            show_issues(checkers)
-        elif os.path.isdir(source_path_p + '/' + file_name):
-            check_path(source_path_p + "/" + file_name)
+                for report in pool.imap(check_named_source, blobs,
+                                        POOL_CHUNK_SIZE):
+                    reports[shas[report.path]] = report
+                pool.close()
+            except BaseException:
+                pool.terminate()
+                raise
+            finally:
+                pool.join()
+    finally:
+        reader.close()
+
+    output = sys.stdout if args.output is None else open(args.output, 'w')
+    reporter = REPORTERS[args.format](output)
+    try:
+        reporter.start()
+        for occurrence in occurrences:
+            report = reports[occurrence.sha]
+            name = occurrence.name
+            reporter.report_file(file_report.FileReport(
+                name,
+                [issue if issue.issue_loc.path == name
+                 else issue.relocated(name) for issue in report.issues],
+                report.error, skipped=report.skipped))
+        reporter.finish()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if cache is not None:
+        cache.evict()
+    return EXIT_ISSUES if args.fail_on_issues and reporter.issues_count \
+        else 0
+
+
+def run_daemon(argv):
+    parser = argparse.ArgumentParser(
+        prog='dfast.py daemon',
+        description='Keeps results of the analysis of a directory in memory '
+                    'and answers clients over a Unix socket.')
+    parser.add_argument('source_path', help='a directory to analyse')
+    parser.add_argument('--socket', default=daemon.DEFAULT_SOCKET_PATH,
+                        help='a path of the socket (default: %(default)s)')
+    parser.add_argument('--poll-interval', type=float,
+                        default=daemon.DEFAULT_POLL_INTERVAL,
+                        help='seconds between polls of the files '
+                             '(default: %(default)s)')
+    parser.add_argument('--no-snippets', action='store_true',
+                        help='do not report code snippets of issues')
+    args = parser.parse_args(argv)
+
+    init_worker(None, not args.no_snippets, file_budget=budget.FileBudget())
+    analysis_daemon = daemon.AnalysisDaemon(args.source_path, collect_paths,
+                                            check_file, REPORTERS,
+                                            args.poll_interval)
+    try:
+        daemon.serve(analysis_daemon, args.socket)
+    except socket.error as e:
+        fail(str(e))
+
+
+def run_client(argv):
+    parser = argparse.ArgumentParser(
+        prog='dfast.py client',
+        description='Sends a request to a running dfast daemon.')
+    parser.add_argument('command', choices=('analyze', 'issues', 'shutdown'),
+                        help='analyze the paths, report all current issues '
+                             'or stop the daemon')
+    parser.add_argument('paths', nargs='*', help='files to analyze')
+    parser.add_argument('--socket', default=daemon.DEFAULT_SOCKET_PATH,
+                        help='a path of the socket (default: %(default)s)')
+    parser.add_argument('-f', '--format', choices=sorted(REPORTERS),
+                        default='text',
+                        help='an output format (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    request = {'command': args.command, 'format': args.format,
+               'paths': [os.path.abspath(path) for path in args.paths]}
+    try:
+        daemon.send_request(request, sys.stdout, args.socket)
+    except socket.error as e:
+        fail('Error: the daemon does not answer on ' + args.socket + ': ' +
+             str(e))
+
+
+def run_merge(argv):
+    """Merges JSON Lines reports and returns the exit code.
+
+    The exit code is EXIT_ISSUES if the merged report has issues and 0
+    otherwise, as the merge is what gates a sharded run.
+
+    """
+
+    parser = argparse.ArgumentParser(
+        prog='dfast.py merge',
+        description='Merges JSON Lines reports, e.g. of shards, into a '
+                    'single report sorted by path with equal issues '
+                    'reported once. Exits with %d if there are issues.'
+                    % EXIT_ISSUES)
+    parser.add_argument('reports', nargs='+', metavar='REPORT',
+                        help='a JSON Lines report, "-" means standard input')
+    parser.add_argument('-f', '--format', choices=sorted(REPORTERS),
+                        default='text',
+                        help='an output format (default: %(default)s)')
+    parser.add_argument('-o', '--output',
+                        help='a file to write the report to (default: '
+                             'standard output)')
+    args = parser.parse_args(argv)
+
+    streams = []
+    try:
+        for path in args.reports:
+            streams.append(sys.stdin if path == '-' else open(path, 'r'))
+        reports = result_merge.merge_reports(streams)
+    except (IOError, result_merge.MergeError) as e:
+        fail(str(e))
+    finally:
+        for stream in streams:
+            if stream is not sys.stdin:
+                stream.close()
+
+    output = sys.stdout if args.output is None else open(args.output, 'w')
+    reporter = REPORTERS[args.format](output)
+    try:
+        reporter.start()
+        for report in reports:
+            reporter.report_file(report)
+        reporter.finish()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return EXIT_ISSUES if reporter.issues_count else 0
+
+
+def main(argv=None):
+    """Runs dfast and returns the exit code.
+
+    The exit code is 0 unless --fail-on-issues is given and an issue is
+    reported, so shards and runs writing a baseline do not fail. A merge
+    of shards fails on issues. Fatal errors exit with EXIT_FATAL.
+
+    """
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'daemon':
+        return run_daemon(argv[1:])
+    if argv and argv[0] == 'client':
+        return run_client(argv[1:])
+    if argv and argv[0] == 'merge':
+        return run_merge(argv[1:])
+    if argv and argv[0] == 'history':
+        return run_history(argv[1:])
+
+    args = parse_args(argv)
+    deadline = None
+    if args.time_budget is not None:
+        deadline = time.time() + args.time_budget
+
+    cache = open_cache(args)
+
+    known_issues = None
+    if args.baseline is not None:
+        try:
+            known_issues = baseline.load_baseline(args.baseline)
+        except baseline.BaselineError as e:
+            fail(str(e))
+    elif args.write_baseline is not None:
+        known_issues = baseline.Baseline()
+
+    run_profiler = None
+    if args.profile or args.profile_output is not None:
+        run_profiler = profiler.Profiler(args.profile_slowest)
+
+    changed_lines = None
+    if args.diff_base is not None:
+        try:
+            changed_lines = git_diff.get_changed_lines(args.diff_base,
+                                                       args.source_path)
+        except git.GitError as e:
+            fail(str(e))
+
+    if args.files_from is None:
+        excludes = args.exclude
+        if not args.no_default_excludes:
+            excludes = list(discovery.DEFAULT_EXCLUDES) + excludes
+        includes = args.include or list(discovery.DEFAULT_INCLUDES)
+        if args.archives:
+            includes = includes + list(archives.ARCHIVE_GLOBS)
+        file_discovery = discovery.FileDiscovery(includes, excludes,
+                                                 not args.no_gitignore)
+        paths = file_discovery.iter_paths(args.source_path)
+        file_list = None
+    elif args.files_from == '-':
+        file_list = sys.stdin
+        paths = discovery.read_file_list(file_list)
+    else:
+        try:
+            file_list = open(args.files_from, 'rb')
+        except IOError as e:
+            fail(str(e))
+        paths = discovery.read_file_list(file_list)
+
+    if args.shard is not None:
+        shard = args.shard
+        base_path = args.source_path
+        if changed_lines is not None:
+            changed_lines = dict((path, hunks) for path, hunks
+                                 in changed_lines.items()
+                                 if shard.contains(path, base_path))
+        paths = (path for path in paths if shard.contains(path, base_path))
+
+    file_budget = budget.FileBudget(args.max_file_size, args.max_vertices,
+                                    args.file_time_limit)
+
+    output = sys.stdout if args.output is None else open(args.output, 'w')
+    reporter = REPORTERS[args.format](output)
+    try:
+        reporter.start()
+        analysed_count, remaining_paths = check_path(
+            args.source_path, reporter, args.jobs, cache,
+            not args.no_snippets, run_profiler, changed_lines,
+            args.clone_min_size if args.clones else None, paths, file_budget,
+            args.max_files_per_worker, args.normalize, deadline,
+            known_issues)
+        reporter.finish()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if file_list is not None and file_list is not sys.stdin:
+            file_list.close()
+
+    if args.time_budget is not None:
+        report_time_budget(args, analysed_count, remaining_paths)
+    if args.baseline is not None:
+        sys.stderr.write('Baseline: %d known issues suppressed.\n' %
+                         known_issues.suppressed_count)
+    if args.write_baseline is not None:
+        try:
+            known_issues.write(args.write_baseline)
+        except baseline.BaselineError as e:
+            fail(str(e))
+
+    if args.profile:
+        sys.stderr.write(run_profiler.format())
+    if args.profile_output is not None:
+        with open(args.profile_output, 'w') as profile_output:
+            json.dump(run_profiler.to_dict(), profile_output, indent=2,
+                      sort_keys=True)
+
+    if cache is not None:
+        cache.evict()
+    return EXIT_ISSUES if args.fail_on_issues and reporter.issues_count \
+        else 0
 
-source_path = sys.argv[1]
 
-check_path(source_path)
+if __name__ == '__main__':
+    sys.exit(main())
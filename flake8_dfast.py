@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""The module represents a flake8 plugin running the equal checkers.
+
+The plugin checks the tree flake8 has already parsed, so files are neither
+read nor parsed twice. Issues are reported with stable codes:
+
+    DFA101  boolean operation with equal arguments
+    DFA102  comparison of equal arguments
+    DFA103  if branches with equal conditions
+    DFA104  equal if-elif-else branches
+    DFA105  equal consecutive assignments
+    DFA106  attribute assigned twice in __init__
+    DFA107  dict literal with equal keys
+
+Examples:
+        The plugin is registered in the flake8 config, e.g. in setup.cfg:
+
+        [flake8:local-plugins]
+        extension =
+            DFA = flake8_dfast:DfastChecker
+        paths =
+            path2ProjectRoot
+
+        $ flake8 --select DFA path2ProjectToAnalyse
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import dfast
+
+PLUGIN_VERSION = '1.0'
+ERROR_CODES = {
+    'equal-bool-op': 'DFA101',
+    'equal-comparison': 'DFA102',
+    'equal-if-conditions': 'DFA103',
+    'equal-if-branches': 'DFA104',
+    'equal-statements': 'DFA105',
+    'equal-init-attributes': 'DFA106',
+    'equal-dict-keys': 'DFA107'
+}
+
+
+class DfastChecker(object):
+    """The class represents a flake8 AST plugin.
+
+    Attributes:
+        tree (ast.AST): The tree of the file parsed by flake8.
+        filename (str): A path to the file.
+        lines (list of str): Lines of the file.
+
+    """
+
+    name = 'dfast'
+    version = PLUGIN_VERSION
+
+    def __init__(self, tree, filename, lines):
+        self.tree = tree
+        self.filename = filename
+        self.lines = lines
+
+    def run(self):
+        """Yields flake8 results as tuples of a line, a column, a message
+        and the type of the plugin."""
+        source = (self.filename, ''.join(self.lines), self.tree)
+        for report in dfast.analyse_sources([source], render_snippets=False):
+            for issue in report.issues:
+                code = ERROR_CODES.get(issue.checker_id)
+                if code is None:
+                    continue
+                yield (issue.issue_loc.line, issue.issue_loc.column,
+                       code + ' ' + issue.explanation, type(self))
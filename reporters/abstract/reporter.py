@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""The module represents abstract reporter class.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+from abc import ABCMeta, abstractmethod
+
+import analysis.file_report as file_report
+
+
+def to_unicode(value):
+    """Returns the string as unicode, replacing bytes which are not UTF-8."""
+    if value is None or isinstance(value, unicode):
+        return value
+    return value.decode('utf-8', 'replace')
+
+
+class Reporter(object):
+    """The class presents an abstract reporter.
+
+    A reporter writes every issue to the output as soon as it gets the issue
+    and keeps nothing but counters, so its memory does not depend on the
+    number of issues.
+
+    Attributes:
+        output (file): A stream to write the report to.
+        issues_count (int): A number of reported issues.
+        errors_count (int): A number of files which failed to be analysed.
+        skipped_count (int): A number of files skipped because of limits of
+        their analysis.
+
+    """
+
+    __metaclass__ = ABCMeta
+
+    def __init__(self, output):
+        """Reporter constructor.
+
+            Args:
+                output (file): A stream to write the report to.
+
+        """
+
+        self.output = output
+        self.issues_count = 0
+        self.errors_count = 0
+        self.skipped_count = 0
+
+    def start(self):
+        """Writes the beginning of the report."""
+        pass
+
+    def report_file(self, report):
+        """Writes the issues, the error and the skip reason of a file report.
+
+            Args:
+                report (FileReport): A report of a file.
+
+            Returns:
+                None.
+
+            Raises:
+                TypeError: If arg "report" is not an instance of "FileReport".
+
+        """
+
+        if not isinstance(report, file_report.FileReport):
+            raise TypeError('Error: arg \"report\" is not an instance \
+                            of \"FileReport\"!')
+
+        if report.error is not None:
+            self.errors_count += 1
+            self.report_error(report.path, report.error)
+        if report.skipped is not None:
+            self.skipped_count += 1
+            self.report_skipped(report.path, report.skipped)
+        for issue in report.issues:
+            self.issues_count += 1
+            self.report_issue(issue)
+
+    @abstractmethod
+    def report_issue(self, issue):
+        """Writes an issue.
+
+            Args:
+                issue (Issue): An issue to write.
+
+        """
+
+    @abstractmethod
+    def report_error(self, path, message):
+        """Writes a message about a file which failed to be analysed.
+
+            Args:
+                path (str): A path to the file.
+                message (str): A message describing the failure.
+
+        """
+
+    @abstractmethod
+    def report_skipped(self, path, reason):
+        """Writes a message about a file skipped because of a limit.
+
+            Args:
+                path (str): A path to the file.
+                reason (str): A message describing the exceeded limit.
+
+        """
+
+    def finish(self):
+        """Writes the end of the report and flushes the output."""
+        self.output.flush()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""The module represents a reporter writing JSON Lines.
+
+Every line of the output is a JSON object. Issues look like
+{"type": "issue", "path": ..., "line": ..., "column": ..., "end_line": ...,
+"checker": ..., "message": ..., "snippet": ...} and failed files look like
+{"type": "error", "path": ..., "message": ...}.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import json
+
+import reporters.abstract.reporter as reporter
+
+
+class JsonLinesReporter(reporter.Reporter):
+    """The class represents a reporter writing a JSON object per line."""
+
+    def _write_record(self, record):
+        self.output.write(json.dumps(record, sort_keys=True) + '\n')
+
+    def report_issue(self, issue):
+        self._write_record({
+            'type': 'issue',
+            'path': reporter.to_unicode(issue.issue_loc.path),
+            'line': issue.issue_loc.line,
+            'column': issue.issue_loc.column,
+            'end_line': issue.issue_loc.end_line,
+            'checker': issue.checker_id,
+            'fingerprint': issue.fingerprint,
+            'message': reporter.to_unicode(issue.explanation),
+            'snippet': reporter.to_unicode(issue.code_snippet)
+        })
+
+    def report_error(self, path, message):
+        self._write_record({
+            'type': 'error',
+            'path': reporter.to_unicode(path),
+            'message': reporter.to_unicode(message)
+        })
+
+    def report_skipped(self, path, reason):
+        self._write_record({
+            'type': 'skipped',
+            'path': reporter.to_unicode(path),
+            'reason': reporter.to_unicode(reason)
+        })
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""The module represents a reporter writing SARIF 2.1.0 logs.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import os
+import json
+import urllib
+
+import reporters.abstract.reporter as reporter
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_VERSION = '2.1.0'
+TOOL_NAME = 'dfast'
+FINGERPRINT_NAME = 'dfastFingerprint/v1'
+
+
+def _path_to_uri(path):
+    return urllib.quote(path.replace(os.sep, '/'))
+
+
+class SarifReporter(reporter.Reporter):
+    """The class represents a reporter writing a SARIF log with a single run.
+
+    Results are written one by one inside the "results" array. Messages
+    about failed and skipped files are kept until the end, as SARIF puts them after the
+    results, in the invocation of the run.
+
+    """
+
+    def __init__(self, output):
+        super(SarifReporter, self).__init__(output)
+        self._notifications = []
+        self._has_results = False
+
+    def start(self):
+        header = json.dumps({'$schema': SARIF_SCHEMA,
+                             'version': SARIF_VERSION}, sort_keys=True)
+        tool = json.dumps({'driver': {'name': TOOL_NAME}}, sort_keys=True)
+        # the header object is left open to stream the results into it
+        self.output.write(header[:-1] + ', "runs": [{"tool": ' + tool +
+                          ', "results": [\n')
+
+    def report_issue(self, issue):
+        issue_loc = issue.issue_loc
+        region = {'startLine': issue_loc.line,
+                  'startColumn': issue_loc.column + 1,
+                  'endLine': max(issue_loc.end_line, issue_loc.line)}
+        if issue.code_snippet:
+            region['snippet'] = {
+                'text': reporter.to_unicode(issue.code_snippet)}
+        result = {
+            'ruleId': issue.checker_id,
+            'level': 'error',
+            'message': {'text': reporter.to_unicode(issue.explanation)},
+            'locations': [{'physicalLocation': {
+                'artifactLocation': {'uri': _path_to_uri(issue_loc.path)},
+                'region': region
+            }}]
+        }
+        if issue.fingerprint is not None:
+            result['partialFingerprints'] = {
+                FINGERPRINT_NAME: issue.fingerprint}
+        separator = ',\n' if self._has_results else ''
+        self._has_results = True
+        self.output.write(separator + json.dumps(result, sort_keys=True))
+
+    def report_error(self, path, message):
+        self._notifications.append({
+            'level': 'error',
+            'message': {'text': reporter.to_unicode(message)},
+            'locations': [{'physicalLocation': {
+                'artifactLocation': {'uri': _path_to_uri(path)}
+            }}]
+        })
+
+    def report_skipped(self, path, reason):
+        self._notifications.append({
+            'level': 'warning',
+            'message': {'text': u'skipped: ' + reporter.to_unicode(reason)},
+            'locations': [{'physicalLocation': {
+                'artifactLocation': {'uri': _path_to_uri(path)}
+            }}]
+        })
+
+    def finish(self):
+        invocation = {'executionSuccessful': True,
+                      'toolExecutionNotifications': self._notifications}
+        self.output.write('\n], "invocations": [' +
+                          json.dumps(invocation, sort_keys=True) + ']}]}\n')
+        super(SarifReporter, self).finish()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""The module represents a reporter writing plain text.
+
+Copyright (C) 2016-2017 Arthur Vaschenkov
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+
+import reporters.abstract.reporter as reporter
+
+
+class TextReporter(reporter.Reporter):
+    """The class represents a reporter writing issue descriptions as text."""
+
+    def report_issue(self, issue):
+        self.output.write(issue.description + '\n')
+
+    def report_error(self, path, message):
+        self.output.write(message + '\n')
+
+    def report_skipped(self, path, reason):
+        self.output.write(path + ': skipped: ' + reason + '\n')